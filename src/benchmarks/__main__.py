@@ -0,0 +1,3 @@
+from src.benchmarks.generator_benchmark import main
+
+main()
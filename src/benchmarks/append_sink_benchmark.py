@@ -0,0 +1,69 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.common.sink import append_dataframe
+
+# Compares the automator's former concat-and-rewrite write path with the append sink.
+# Run with: python -m src.benchmarks.append_sink_benchmark --sizes 10000,100000,1000000
+
+
+def make_batch(start_id, batch_size):
+    return pd.DataFrame({
+        "RecordID": np.arange(start_id, start_id + batch_size),
+        "CustomerID": np.random.randint(100000, 225000, batch_size),
+        "Category": np.random.choice(["Savings", "Checking", "Business", "Investment"], batch_size),
+        "Amount": np.round(np.random.uniform(-23000, 991234, batch_size), 2),
+        "OpenedDate": np.random.choice(["2021-03-14", "2019-11-02", "2024-07-30"], batch_size),
+        "Flag": np.random.choice([True, False], batch_size),
+    })
+
+
+def rewrite_batch(df, file_path):
+    existing = pd.read_csv(file_path)
+    updated = pd.concat([existing, df], ignore_index=True)
+    updated.to_csv(file_path, index=False)
+
+
+def time_batches(write_func, file_path, start_id, batch_size, repeats):
+    timings = []
+    for i in range(repeats):
+        batch = make_batch(start_id + i * batch_size, batch_size)
+        started = time.perf_counter()
+        write_func(batch, file_path)
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def run(sizes, batch_size, repeats):
+    print(f"{'rows in file':>14} {'rewrite (ms)':>14} {'append (ms)':>14} {'speedup':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            base = make_batch(0, size)
+            rewrite_path = os.path.join(tmp_dir, f"rewrite_{size}.csv")
+            append_path = os.path.join(tmp_dir, f"append_{size}.csv")
+            base.to_csv(rewrite_path, index=False)
+            base.to_csv(append_path, index=False)
+            rewrite_ms = time_batches(rewrite_batch, rewrite_path, size, batch_size, repeats) * 1000
+            append_ms = time_batches(append_dataframe, append_path, size, batch_size, repeats) * 1000
+            print(f"{size:>14,} {rewrite_ms:>14.2f} {append_ms:>14.2f} {rewrite_ms / append_ms:>9.1f}x")
+            os.remove(rewrite_path)
+            os.remove(append_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-batch write cost of the automator sinks as the file grows.")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="Comma separated row counts of the pre-existing file.")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.batch_size, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import time
+
+from src.config.config import fake, vfake
+
+# Rows/sec of the Faker-backed string columns of each entity, per-row Faker vs. VectorFaker.
+# Run with: python -m src.benchmarks.faker_benchmark --rows 50000
+
+ENTITY_COLUMNS = {
+    "customers": [("first_name", {}), ("last_name", {}), ("ssn", {}), ("email", {}), ("phone_number", {}),
+                  ("street_address", {}), ("city", {}), ("state", {}), ("zipcode", {}), ("job", {}),
+                  ("company", {})],
+    "branches": [("street_address", {}), ("city", {}), ("state", {}), ("zipcode", {}), ("name", {}),
+                 ("phone_number", {})],
+    "transactions": [("company", {}), ("city", {}), ("time", {})],
+    "aml_compliance": [("sentence", {"nb_words": 6})],
+    "depots": [("company", {})],
+    "digital_interactions": [("ipv4", {})],
+}
+
+
+def per_row(columns, rows):
+    started = time.perf_counter()
+    for method, kwargs in columns:
+        provider = getattr(fake, method)
+        [provider(**kwargs) for _ in range(rows)]
+    return time.perf_counter() - started
+
+
+def vectorized(columns, rows):
+    started = time.perf_counter()
+    for method, kwargs in columns:
+        getattr(vfake, method)(rows, **kwargs)
+    return time.perf_counter() - started
+
+
+def run(rows):
+    print(f"{'entity':<22} {'per-row rows/s':>15} {'vector rows/s':>15} {'speedup':>9} {'warm-up (s)':>12}")
+    for entity, columns in ENTITY_COLUMNS.items():
+        before = per_row(columns, rows)
+        # The first call builds the vocabulary pools; report it separately from steady-state throughput.
+        warm_up = vectorized(columns, 1)
+        after = vectorized(columns, rows)
+        print(f"{entity:<22} {rows / before:>15,.0f} {rows / after:>15,.0f} {before / after:>8.1f}x {warm_up:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of Faker string columns, per-row vs. vectorized.")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
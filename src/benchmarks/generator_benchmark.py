@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Rows/sec, peak RSS and bytes written of every initial generator and every automator batch function, over a
+# sweep of scale factors. Each measurement runs in a fresh interpreter so that peak RSS belongs to it alone.
+# Run with: python -m src.benchmarks --scale-factors 1,5,10 --output benchmark_results.json
+
+INITIAL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "initial_data_generation")
+INITIAL_DATASETS = ["customers", "accounts", "loans", "branches", "marketing", "digital_interactions",
+                    "risk_alerts", "shares", "depots", "aml_compliance", "transactions"]
+# Branches are only generated initially
+AUTOMATOR_ENTITIES = [name for name in INITIAL_DATASETS if name != "branches"]
+
+
+def _dataset_bytes(path):
+    from src.common.sink import dataset_files
+
+    return sum(os.path.getsize(f) for f in dataset_files(path))
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _initial_main():
+    # main.py imports its generators and utils as top-level modules
+    sys.path.insert(0, INITIAL_DIR)
+    import main
+
+    return main
+
+
+def measure_initial(entity):
+    main = _initial_main()
+    from src.common.sink import dataset_path
+    from utils import combine_chunks
+
+    num_rows = dict(main.REQUIRED_DATASETS)[entity]
+    customer_ids = main.entity_ids("customers", 0, main.num_customers_large)
+    # sharded=True: transactions draw from the global AccountID space instead of reading an accounts dataset
+    references = main.dataset_references(entity, customer_ids, sharded=True)
+    main.vfake.warm_up()
+    started = time.perf_counter()
+    main.generate_dataset(entity, num_rows, references)
+    generated = time.perf_counter()
+    combine_chunks(entity)
+    finished = time.perf_counter()
+    return {"rows": num_rows, "seconds": finished - started, "generate_seconds": generated - started,
+            "combine_seconds": finished - generated,
+            "bytes_written": _dataset_bytes(dataset_path(main.DATA_DIR, entity))}
+
+
+def measure_automator(entity, batch_size, batches):
+    main = _initial_main()
+    from src.common.sink import dataset_path
+    from utils import combine_chunks
+
+    # The batch functions need the customers and accounts they reference; these are set up untimed.
+    customer_ids = main.entity_ids("customers", 0, main.num_customers_large)
+    for name, num_rows in main.REQUIRED_DATASETS:
+        if name in ("customers", "accounts"):
+            main.generate_dataset(name, num_rows, main.dataset_references(name, customer_ids))
+            combine_chunks(name)
+
+    from src.data_automator.id_registry import registry
+    from src.data_automator.data_generator.batch_generator import generate_batch
+
+    registry.seed()
+    main.vfake.warm_up()
+    path = dataset_path(main.DATA_DIR, entity)
+    bytes_before = _dataset_bytes(path)
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(batches):
+        rows += generate_batch(entity, batch_size)
+    seconds = time.perf_counter() - started
+    return {"rows": rows, "seconds": seconds, "batch_size": batch_size, "batches": batches,
+            "bytes_written": _dataset_bytes(path) - bytes_before}
+
+
+def run_child(args):
+    if args.kind == "initial":
+        result = measure_initial(args.entity)
+    else:
+        result = measure_automator(args.entity, args.batch_size, args.batches)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    with open(args.result_file, "w") as f:
+        json.dump(result, f)
+
+
+def run_one(kind, entity, scale_factor, args):
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as tmp_dir:
+        result_file = os.path.join(tmp_dir, "result.json")
+        env = dict(os.environ, SCALE_FACTOR=str(scale_factor), DATA_DIR=os.path.join(tmp_dir, "data"),
+                   TEMP_DATA_DIR=os.path.join(tmp_dir, "tmp"))
+        command = [sys.executable, "-m", "src.benchmarks.generator_benchmark", "--child", kind, "--entity", entity,
+                   "--batch-size", str(args.batch_size), "--batches", str(args.batches), "--result-file", result_file]
+        completed = subprocess.run(command, env=env, cwd=tmp_dir, stdout=None if args.verbose else subprocess.DEVNULL,
+                                   stderr=None if args.verbose else subprocess.PIPE, text=True)
+        if completed.returncode != 0 or not os.path.exists(result_file):
+            error = (completed.stderr or "").strip().splitlines()[-1:] or ["see --verbose"]
+            return {"kind": kind, "entity": entity, "scale_factor": scale_factor, "error": error[0]}
+        with open(result_file) as f:
+            result = json.load(f)
+    result["rows_per_sec"] = result["rows"] / result["seconds"] if result["seconds"] else None
+    return dict({"kind": kind, "entity": entity, "scale_factor": scale_factor}, **result)
+
+
+def print_result(result):
+    if "error" in result:
+        print(f"{result['kind']:<10} {result['entity']:<22} {result['scale_factor']:>5}  failed: {result['error']}")
+        return
+    print(f"{result['kind']:<10} {result['entity']:<22} {result['scale_factor']:>5} {result['rows']:>12,} "
+          f"{result['rows_per_sec']:>14,.0f} {result['peak_rss_mb']:>10,.1f} {result['bytes_written'] / 1e6:>12,.2f}")
+
+
+def run(args):
+    # Make `src` importable from the children, which run in their own temporary directory.
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ["PYTHONPATH"] = os.pathsep.join(p for p in (root, os.environ.get("PYTHONPATH")) if p)
+    entities = args.entities.split(",") if args.entities else None
+    plan = [("initial", entity) for entity in INITIAL_DATASETS if "initial" in args.kinds]
+    plan += [("automator", entity) for entity in AUTOMATOR_ENTITIES if "automator" in args.kinds]
+    print(f"{'kind':<10} {'entity':<22} {'SF':>5} {'rows':>12} {'rows/s':>14} {'peak MB':>10} {'MB written':>12}")
+    results = []
+    for scale_factor in args.scale_factors:
+        for kind, entity in plan:
+            if entities is None or entity in entities:
+                results.append(run_one(kind, entity, scale_factor, args))
+                print_result(results[-1])
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+              "platform": platform.platform(), "cpu_count": os.cpu_count(),
+              "output_format": os.getenv("OUTPUT_FORMAT", "csv"), "batch_size": args.batch_size,
+              "batches": args.batches, "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks",
+                                     description="Throughput, peak RSS and bytes written of the data generators.")
+    parser.add_argument("--scale-factors", default="1", type=lambda s: [int(v) for v in s.split(",")],
+                        help="Comma separated SCALE_FACTOR values to sweep.")
+    parser.add_argument("--kinds", default="initial,automator", type=lambda s: s.split(","),
+                        help="initial (bulk generators), automator (batch functions) or both.")
+    parser.add_argument("--entities", default="", help="Comma separated subset of datasets; default all.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per automator batch.")
+    parser.add_argument("--batches", type=int, default=10, help="Automator batches timed per entity.")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--verbose", action="store_true", help="Show the generators' own log output.")
+    parser.add_argument("--child", choices=["initial", "automator"], help=argparse.SUPPRESS)
+    parser.add_argument("--entity", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        args.kind = args.child
+        run_child(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
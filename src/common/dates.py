@@ -0,0 +1,111 @@
+import datetime
+import os
+import re
+
+import numpy as np
+from dotenv import load_dotenv
+
+from src.common.seeding import default_rng
+
+load_dotenv()
+
+# Pins 'now'/'today' (e.g. "2025-01-01 00:00:00") so that regenerated chunks match byte for byte on a later
+# day; by default relative bounds follow the wall clock.
+REFERENCE_TIME = os.getenv("REFERENCE_TIME", "")
+
+# Bulk replacement for fake.date_between(...).strftime('%Y-%m-%d') and friends. Bounds accept what the
+# generators pass to Faker ('-10y', 'today', 'now', date objects, 'YYYY-MM-DD' strings) as well as
+# per-row arrays, and sampling/formatting happen on datetime64 arrays in one pass.
+
+# Same units and day lengths as Faker's relative date strings
+_RELATIVE_PART = re.compile(r"([+-]?\d+)([yMwdhms])")
+_DAYS_PER_UNIT = {"y": 365.24, "M": 30.42, "w": 7, "d": 1, "h": 1 / 24, "m": 1 / 1440, "s": 1 / 86400}
+
+
+def _parse_relative(spec):
+    parts = _RELATIVE_PART.findall(spec)
+    if not parts or "".join(value + unit for value, unit in parts) != spec.replace(" ", ""):
+        raise ValueError(f"Can't parse date string `{spec}`")
+    return sum(int(value) * _DAYS_PER_UNIT[unit] for value, unit in parts)
+
+
+def _now():
+    if REFERENCE_TIME:
+        return datetime.datetime.fromisoformat(REFERENCE_TIME)
+    return datetime.datetime.now()
+
+
+def to_datetime64(value, unit="D"):
+    if isinstance(value, np.ndarray):
+        return value.astype(f"datetime64[{unit}]")
+    if value is None or value in ("today", "now"):
+        now = np.datetime64(_now(), "s")
+        return now.astype(f"datetime64[{unit}]")
+    if isinstance(value, str) and value[0] in "+-":
+        seconds = int(np.floor(_parse_relative(value) * 86400))
+        if unit == "D":
+            # Faker adds the offset to today's date, which drops the fractional day.
+            return np.datetime64(_now().date(), "D") + np.timedelta64(seconds // 86400, "D")
+        return np.datetime64(_now(), "s").astype(f"datetime64[{unit}]") + np.timedelta64(seconds, "s")
+    return np.datetime64(value, unit)
+
+
+def random_dates(start_date, end_date, n, rng=default_rng, unit="D"):
+    start = to_datetime64(start_date, unit)
+    end = to_datetime64(end_date, unit)
+    # Inclusive of both bounds; an empty range collapses to the start bound.
+    span = np.maximum((end - start).astype(np.int64) + 1, 1)
+    offsets = np.floor(rng.random(n) * span).astype(np.int64)
+    return start + offsets.astype(f"timedelta64[{unit}]")
+
+
+def _years_ago(today, years):
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        # 29 February in a non-leap target year
+        return today.replace(year=today.year - years, day=28)
+
+
+def random_birth_dates(minimum_age, maximum_age, n, rng=default_rng):
+    # Same bounds as Faker's date_of_birth
+    today = _now().date()
+    start = _years_ago(today, maximum_age + 1) + datetime.timedelta(days=1)
+    end = _years_ago(today, minimum_age)
+    return random_dates(start, end, n, rng)
+
+
+def add_years(dates, years):
+    # Same result as adding pd.DateOffset(years=...) row by row: the day of month is kept and
+    # clipped to the end of the target month (29 February -> 28 February).
+    dates = dates.astype("datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    day_of_month = (dates - months.astype("datetime64[D]")).astype(np.int64)
+    target_months = months + (np.asarray(years) * 12).astype("timedelta64[M]")
+    month_starts = target_months.astype("datetime64[D]")
+    month_lengths = ((target_months + 1).astype("datetime64[D]") - month_starts).astype(np.int64)
+    return month_starts + np.minimum(day_of_month, month_lengths - 1).astype("timedelta64[D]")
+
+
+def format_dates(values):
+    days = np.asarray(values, dtype="datetime64[D]")
+    if len(days) == 0 or np.isnat(days).any():
+        return np.datetime_as_string(days, unit="D").astype(object)
+    # Dates repeat heavily (a 10 year range has ~3650 distinct days), so format each distinct day once.
+    ordinals = days.astype(np.int64)
+    first = ordinals.min()
+    span = ordinals.max() - first + 1
+    if span > len(days):
+        return np.datetime_as_string(days, unit="D").astype(object)
+    table = np.datetime_as_string(np.arange(first, first + span).astype("datetime64[D]"), unit="D").astype(object)
+    return table[ordinals - first]
+
+
+def format_datetimes(values):
+    # 'YYYY-MM-DDTHH:MM:SS' -> 'YYYY-MM-DD HH:MM:SS' by patching the separator code point in place.
+    text = np.datetime_as_string(values, unit="s")
+    if len(text) == 0:
+        return text.astype(object)
+    codes = text.view(np.uint32).reshape(len(text), -1).copy()
+    codes[:, 10] = ord(" ")
+    return codes.view(text.dtype).reshape(len(text)).astype(object)
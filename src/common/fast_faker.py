@@ -0,0 +1,146 @@
+import copy
+import os
+import threading
+
+import numpy as np
+
+from src.common.seeding import default_rng, seed_faker
+
+# Number of Faker samples drawn once per provider method. Values are then produced by indexing into
+# these pools, and digit positions of pattern-like values (SSNs, phone numbers, house numbers) are
+# re-randomized so that cardinality is not capped by the pool size.
+FAKER_POOL_SIZE = int(os.getenv("FAKER_POOL_SIZE", 5000))
+
+_DIGIT_ZERO = ord("0")
+_DIGIT_NINE = ord("9")
+_OCTETS = np.array([str(i) for i in range(256)], dtype=object)
+_TWO_DIGITS = np.array([f"{i:02d}" for i in range(100)], dtype=object)
+
+
+def _stabilize_provider_order(faker):
+    # The it_IT address provider builds its city list from a set, so its order (and thus what a seeded
+    # Faker returns) changes with each process's string hash seed.
+    for factory in getattr(faker, "factories", [faker]):
+        for provider in factory.get_providers():
+            if isinstance(getattr(provider, "cities", None), list):
+                provider.cities = sorted(provider.cities)
+
+
+class VectorFaker:
+    """Array-returning counterpart of the shared Faker instance: ``vfake.city(n)`` ~ ``[fake.city() ...]``."""
+
+    def __init__(self, faker, pool_size=FAKER_POOL_SIZE, rng=None):
+        self.faker = faker
+        _stabilize_provider_order(faker)
+        self.pool_size = pool_size
+        self.rng = rng if rng is not None else default_rng
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def using(self, rng):
+        # Same pools, different random stream: lets every chunk draw from its own generator.
+        view = copy.copy(self)
+        view.rng = rng
+        return view
+
+    def pool(self, method, sampler=None):
+        values = self._pools.get(method)
+        if values is None:
+            with self._lock:
+                values = self._pools.get(method)
+                if values is None:
+                    # Looked up per call: a multi-locale Faker picks the locale on attribute access.
+                    sampler = sampler or (lambda: getattr(self.faker, method)())
+                    # Seeded per pool, so a pool's contents do not depend on which pools were built before it.
+                    seed_faker(self.faker, "faker_pool", method)
+                    values = np.array([sampler() for _ in range(self.pool_size)], dtype=object)
+                    self._pools[method] = values
+        return values
+
+    def warm_up(self):
+        # Build every pool up front, e.g. before forking workers so that they inherit identical pools.
+        for method in ("first_name", "last_name", "ssn", "email", "phone_number", "street_address", "city",
+                       "state", "zipcode", "job", "company", "sentence"):
+            getattr(self, method)(0)
+
+    def _sample(self, method, n, sampler=None):
+        values = self.pool(method, sampler)
+        return values[self.rng.integers(0, len(values), n)]
+
+    def _fill_digits(self, values, keep_prefix=0):
+        # Work on the UCS4 code points of a fixed-width unicode array and overwrite every digit at once.
+        if len(values) == 0:
+            return values
+        fixed = values.astype(str)
+        width = fixed.dtype.itemsize // 4
+        codes = fixed.view(np.uint32).reshape(len(fixed), width).copy()
+        is_digit = (codes >= _DIGIT_ZERO) & (codes <= _DIGIT_NINE)
+        is_digit[:, :keep_prefix] = False
+        codes[is_digit] = self.rng.integers(_DIGIT_ZERO, _DIGIT_NINE + 1, int(is_digit.sum()))
+        return codes.view(f"<U{width}").reshape(len(fixed)).astype(object)
+
+    def first_name(self, n):
+        return self._sample("first_name", n)
+
+    def last_name(self, n):
+        return self._sample("last_name", n)
+
+    def name(self, n):
+        return self.first_name(n) + " " + self.last_name(n)
+
+    def ssn(self, n):
+        return self._fill_digits(self._sample("ssn", n))
+
+    def email(self, n):
+        domains = self._sample("email_domain", n, lambda: self.faker.email().split("@", 1)[1])
+        return self._sample("user_name", n) + "@" + domains
+
+    def phone_number(self, n):
+        # Keep country/area prefixes such as "+41" or "022" intact.
+        return self._fill_digits(self._sample("phone_number", n), keep_prefix=3)
+
+    def street_address(self, n):
+        return self._fill_digits(self._sample("street_address", n))
+
+    def city(self, n):
+        return self._sample("city", n)
+
+    def state(self, n):
+        return self._sample("state", n)
+
+    def zipcode(self, n):
+        return self._fill_digits(self._sample("zipcode", n))
+
+    def job(self, n):
+        return self._sample("job", n)
+
+    def company(self, n):
+        return self._sample("company", n)
+
+    def ipv4(self, n):
+        octets = self.rng.integers(0, 256, (4, n))
+        return _OCTETS[octets[0]] + "." + _OCTETS[octets[1]] + "." + _OCTETS[octets[2]] + "." + _OCTETS[octets[3]]
+
+    def time(self, n):
+        hours = self.rng.integers(0, 24, n)
+        minutes = self.rng.integers(0, 60, n)
+        seconds = self.rng.integers(0, 60, n)
+        return _TWO_DIGITS[hours] + ":" + _TWO_DIGITS[minutes] + ":" + _TWO_DIGITS[seconds]
+
+    def sentence(self, n, nb_words=6):
+        # Faker varies the sentence length by +/-40% around nb_words.
+        low = max(1, int(nb_words * 0.6))
+        high = max(low, int(nb_words * 1.4))
+        lengths = self.rng.integers(low, high + 1, n)
+        words = self.pool("word")
+        capitalized = self.pool("capitalized_word", lambda: self.faker.word().capitalize())
+        text = capitalized[self.rng.integers(0, len(capitalized), n)]
+        for position in range(1, high):
+            next_words = " " + words[self.rng.integers(0, len(words), n)]
+            text = np.where(lengths > position, text + next_words, text)
+        return text + "."
+
+
+def prefixed_numbers(prefix, low, high, n, rng=default_rng):
+    # Vectorized f"{prefix}{np.random.randint(low, high)}" for labels like BranchCode or CampaignName.
+    return prefix + rng.integers(low, high, n).astype(str).astype(object)
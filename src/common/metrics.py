@@ -0,0 +1,253 @@
+import atexit
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+from logger import log
+
+load_dotenv()
+
+# Port of the /metrics endpoint (Prometheus text format); 0 disables it.
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+# cprofile | pyinstrument: profile every batch from the start. /profile/start and /profile/stop toggle the
+# capture at runtime; profiles are written per entity to PROFILE_DIR when it stops and on exit.
+PROFILER = os.getenv("PROFILER", "").lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+HELP = {
+    "datagen_rows_total": ("counter", "Rows generated"),
+    "datagen_bytes_written_total": ("counter", "Bytes written to datasets and part files"),
+    "datagen_batches_total": ("counter", "Automator batches run"),
+    "datagen_batch_errors_total": ("counter", "Automator batches that raised"),
+    "datagen_stage_seconds": ("histogram", "Time per stage: read, build, write, combine"),
+    "datagen_batch_seconds": ("histogram", "Time per automator batch"),
+    "datagen_queue_lag_seconds": ("histogram", "Delay between a batch's scheduled fire time and its start"),
+}
+
+_lock = threading.Lock()
+_counters = {}
+# (name, labels) -> [per-bucket counts, sum, count]
+_histograms = {}
+_profiling = PROFILER
+_profiles = {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * len(BUCKETS), 0.0, 0]
+        histogram[0][next(i for i, bound in enumerate(BUCKETS) if value <= bound)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+
+@contextmanager
+def timer(name, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def stage(entity, stage_name):
+    return timer("datagen_stage_seconds", entity=entity, stage=stage_name)
+
+
+def drain():
+    # Hands a worker process's metrics to the parent (see merge) and starts over.
+    with _lock:
+        snapshot = (dict(_counters), {key: [list(h[0]), h[1], h[2]] for key, h in _histograms.items()})
+        _counters.clear()
+        _histograms.clear()
+    return snapshot
+
+
+def merge(snapshot):
+    counters, histograms = snapshot
+    with _lock:
+        for key, value in counters.items():
+            _counters[key] = _counters.get(key, 0) + value
+        for key, (buckets, total, count) in histograms.items():
+            histogram = _histograms.setdefault(key, [[0] * len(BUCKETS), 0.0, 0])
+            histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+            histogram[1] += total
+            histogram[2] += count
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render():
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(_histograms.items())
+    lines = []
+    typed = set()
+    for (name, labels), value in counters:
+        if name not in typed:
+            kind, text = HELP.get(name, ("counter", name))
+            lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+            typed.add(name)
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), (buckets, total, count) in histograms:
+        if name not in typed:
+            kind, text = HELP.get(name, ("histogram", name))
+            lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+            typed.add(name)
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS, buckets):
+            cumulative += bucket
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiled(entity):
+    # cProfile and pyinstrument only see the thread they are started in, so each batch is profiled in its
+    # own worker thread and the results are combined per entity.
+    backend = _profiling
+    if not backend:
+        yield
+        return
+    if backend == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            session = profiler.stop()
+            with _lock:
+                previous = _profiles.get(entity)
+                _profiles[entity] = session if previous is None else type(session).combine(previous, session)
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one active cProfile per process; this batch overlaps another one.
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.create_stats()
+        with _lock:
+            previous = _profiles.get(entity)
+            if previous is None:
+                import pstats
+
+                _profiles[entity] = pstats.Stats(profiler)
+            else:
+                previous.add(profiler)
+
+
+def start_profiling(backend=None):
+    global _profiling
+    backend = (backend or PROFILER or "cprofile").lower()
+    if backend == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            log.warning("pyinstrument is not installed; profiling with cProfile instead.")
+            backend = "cprofile"
+    _profiling = backend
+    log.info("Profiling batches with %s.", backend)
+
+
+def stop_profiling():
+    global _profiling
+    _profiling = ""
+    return dump_profiles()
+
+
+def dump_profiles():
+    with _lock:
+        profiles = dict(_profiles)
+        _profiles.clear()
+    if not profiles:
+        return []
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    written = []
+    for entity, profile in profiles.items():
+        path = os.path.join(PROFILE_DIR, f"{entity}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        if hasattr(profile, "dump_stats"):
+            path += ".prof"
+            profile.dump_stats(path)
+        else:
+            from pyinstrument.renderers import HTMLRenderer
+
+            path += ".html"
+            with open(path, "w") as f:
+                f.write(HTMLRenderer().render(profile))
+        written.append(path)
+    log.info("Wrote profiles: %s", written)
+    return written
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = render()
+        elif path == "/profile/start":
+            start_profiling(self.path.partition("backend=")[2] or None)
+            body = f"profiling with {_profiling}\n"
+        elif path == "/profile/stop":
+            body = "".join(f"{written}\n" for written in stop_profiling()) or "no profiles captured\n"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Scrapes would otherwise flood stderr every few seconds.
+        pass
+
+
+def start_server(port=METRICS_PORT):
+    if not port:
+        return None
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+    log.info("Serving metrics on http://0.0.0.0:%d/metrics", server.server_address[1])
+    return server
+
+
+if PROFILER:
+    start_profiling(PROFILER)
+atexit.register(dump_profiles)
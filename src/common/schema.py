@@ -0,0 +1,323 @@
+import numpy as np
+import pandas as pd
+
+from src.common.dates import format_dates, format_datetimes, random_birth_dates, random_dates
+from src.common.fast_faker import prefixed_numbers
+from src.config.config import vfake
+
+# Declarative entity schemas. A schema lists its columns in output order; each column has a storage type and
+# a distribution, and a distribution may depend on columns declared before it. compile_schema turns a schema
+# into one vectorized function that builds a batch of n rows, so the initial chunks and the automator batches
+# come from the same code.
+
+# Storage types: category columns are dictionary-encoded and date/datetime columns are typed in the
+# columnar formats; CSV writes every type as text ('YYYY-MM-DD' and 'YYYY-MM-DD HH:MM:SS' for dates).
+TYPES = ("int", "float", "bool", "string", "category", "date", "datetime")
+
+
+class ColumnRef:
+    """Refers to another column of the same row, e.g. dates_between(col("OpenedDate"), "today")."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"col({self.name!r})"
+
+
+def col(name):
+    return ColumnRef(name)
+
+
+class Distribution:
+    """How a column's values are drawn: `sample(batch, *dependency_values)` returns n values."""
+
+    def __init__(self, kind, sample, depends=(), **params):
+        self.kind = kind
+        self.sample = sample
+        self.depends = tuple(depends)
+        self.params = params
+
+    def __repr__(self):
+        return f"{self.kind}({', '.join(f'{k}={v!r}' for k, v in self.params.items())})"
+
+
+class Column:
+    """A named, typed column; hidden columns feed other columns but are not written. The label is the name it
+    is written under, which differs from the name once the column has been renamed by a schema change."""
+
+    def __init__(self, name, dtype, distribution, hidden=False, label=None):
+        if dtype not in TYPES:
+            raise ValueError(f"Column {name}: unknown type '{dtype}', expected one of {TYPES}")
+        self.name = name
+        self.dtype = dtype
+        self.distribution = distribution
+        self.hidden = hidden
+        self.label = label or name
+
+    @property
+    def depends(self):
+        return self.distribution.depends
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.dtype!r}, {self.distribution!r})"
+
+
+class Schema:
+    """One entity: its ID column and ID base, its columns in output order and its version, which every
+    schema change (see evolve) increments."""
+
+    def __init__(self, name, id_column, id_base, columns, version=1):
+        self.name = name
+        self.id_column = id_column
+        self.id_base = id_base
+        self.columns = [Column(id_column, "int", sequence())] + list(columns)
+        self.version = version
+
+    @property
+    def output_columns(self):
+        return [column.label for column in self.columns if not column.hidden]
+
+    def output_column(self, label):
+        column = next((column for column in self.columns if column.label == label and not column.hidden), None)
+        if column is None:
+            raise ValueError(f"{self.name} v{self.version} has no column '{label}'")
+        return column
+
+    @property
+    def references(self):
+        # Entities whose IDs this schema draws foreign keys from
+        return sorted({column.distribution.params["entity"] for column in self.columns
+                       if column.distribution.kind == "reference"})
+
+    def columns_of_type(self, dtype):
+        return [column.label for column in self.columns if column.dtype == dtype and not column.hidden]
+
+    def evolve(self, change):
+        # Returns the next version of this schema with one change applied; `change` is a schema event, e.g.
+        # {"change": "rename_column", "column": "Balance", "new_column": "CurrentBalance"}. The columns that
+        # existed before keep drawing the same random values, so a change only affects the rows built after it.
+        kind = change["change"]
+        columns = list(self.columns)
+        if kind == "add_column":
+            label = change["column"]
+            if label in self.output_columns:
+                raise ValueError(f"{self.name} already has a column '{label}'")
+            # Internal names carry the version, so a dropped column's name can be added again
+            columns.append(Column(f"{label}@v{self.version + 1}", change["type"], default_distribution(change["type"]),
+                                  label=label))
+        else:
+            column = self.output_column(change["column"])
+            if column.name == self.id_column:
+                raise ValueError(f"{self.name}.{self.id_column} is the ID column and cannot be changed")
+            index = columns.index(column)
+            if kind == "drop_column":
+                columns[index] = _copy_column(column, hidden=True)
+            elif kind == "rename_column":
+                if change["new_column"] in self.output_columns:
+                    raise ValueError(f"{self.name} already has a column '{change['new_column']}'")
+                columns[index] = _copy_column(column, label=change["new_column"])
+            elif kind == "retype_column":
+                # The original column stays, hidden, for the columns that depend on it; the converted values
+                # are written under its label.
+                convert = converter(column.dtype, change["type"])
+                retyped = Column(f"{column.name}@v{self.version + 1}", change["type"],
+                                 derived(lambda batch, values: convert(values), column.name), label=column.label)
+                columns[index:index + 1] = [_copy_column(column, hidden=True), retyped]
+            else:
+                raise ValueError(f"Unknown schema change '{kind}'")
+        evolved = Schema(self.name, self.id_column, self.id_base, [], self.version + 1)
+        evolved.columns = columns
+        return evolved
+
+
+def _copy_column(column, **changes):
+    attributes = dict(name=column.name, dtype=column.dtype, distribution=column.distribution, hidden=column.hidden,
+                      label=column.label)
+    attributes.update(changes)
+    return Column(**attributes)
+
+
+class Batch:
+    """State while one batch is built: its size, random stream, referenced IDs and the raw values so far."""
+
+    def __init__(self, ids, references, rng):
+        self.ids = ids
+        self.n = len(ids)
+        self.references = references
+        self.rng = rng
+        self.values = {}
+        self._faker = None
+
+    @property
+    def faker(self):
+        if self._faker is None:
+            self._faker = vfake.using(self.rng)
+        return self._faker
+
+
+def _resolve(batch, value):
+    return batch.values[value.name] if isinstance(value, ColumnRef) else value
+
+
+def _refs(*values):
+    return [value.name for value in values if isinstance(value, ColumnRef)]
+
+
+# Distributions
+
+
+def sequence():
+    return Distribution("sequence", lambda batch: batch.ids)
+
+
+def reference(entity):
+    def sample(batch):
+        ids = batch.references.get(entity)
+        if ids is None:
+            raise ValueError(f"Batch needs the IDs of '{entity}'")
+        return batch.rng.choice(np.asarray(ids).ravel(), batch.n)
+    return Distribution("reference", sample, entity=entity)
+
+
+def choice(values):
+    return Distribution("choice", lambda batch: batch.rng.choice(values, batch.n), values=list(values))
+
+
+def integers(low, high):
+    # high is exclusive, as in numpy
+    return Distribution("integers", lambda batch: batch.rng.integers(low, high, batch.n), low=low, high=high)
+
+
+def uniform(low, high, decimals=2):
+    return Distribution("uniform", lambda batch: np.round(batch.rng.uniform(low, high, batch.n), decimals),
+                        low=low, high=high, decimals=decimals)
+
+
+def fake(method, **kwargs):
+    return Distribution("fake", lambda batch: getattr(batch.faker, method)(batch.n, **kwargs), method=method,
+                        **kwargs)
+
+
+def prefixed(prefix, low, high):
+    return Distribution("prefixed", lambda batch: prefixed_numbers(prefix, low, high, batch.n, batch.rng),
+                        prefix=prefix, low=low, high=high)
+
+
+def constant(value):
+    return Distribution("constant", lambda batch: np.full(batch.n, value, dtype=object), value=value)
+
+
+def dates_between(start, end, unit="D"):
+    # start/end: Faker-style relative dates ('-10y', 'today'), dates, or col(...) of an earlier date column
+    def sample(batch, *_):
+        return random_dates(_resolve(batch, start), _resolve(batch, end), batch.n, batch.rng, unit=unit)
+    return Distribution("dates_between", sample, _refs(start, end), start=start, end=end)
+
+
+def datetimes_between(start, end):
+    return dates_between(start, end, unit="s")
+
+
+def birth_dates(minimum_age, maximum_age):
+    return Distribution("birth_dates", lambda batch: random_birth_dates(minimum_age, maximum_age, batch.n, batch.rng),
+                        minimum_age=minimum_age, maximum_age=maximum_age)
+
+
+def offset(column, low, high, unit):
+    # Each row's value of `column` plus a random whole number of `unit`s in [low, high)
+    return Distribution("offset", lambda batch, values: values + batch.rng.integers(low, high, batch.n).astype(
+        f"timedelta64[{unit}]"), [column], column=column, low=low, high=high, unit=unit)
+
+
+def lookup(index_column, table):
+    # Row-wise table[index] for an integer column that selects, e.g., one stock for several columns
+    table = np.asarray(table, dtype=object)
+    return Distribution("lookup", lambda batch, index: table[index], [index_column], index_column=index_column)
+
+
+def derived(function, *depends, **params):
+    # function(batch, *values of depends); batch.rng is available for columns with their own randomness
+    return Distribution("derived", function, depends, **params)
+
+
+# Schema changes
+
+
+def default_distribution(dtype):
+    # Values of a column added by a schema change
+    return {
+        "int": lambda: integers(0, 1000),
+        "float": lambda: uniform(0, 1000),
+        "bool": lambda: choice([True, False]),
+        "string": lambda: fake("sentence", nb_words=3),
+        "category": lambda: choice(["A", "B", "C", "D"]),
+        "date": lambda: dates_between('-1y', 'today'),
+        "datetime": lambda: datetimes_between('-1y', 'now'),
+    }[dtype]()
+
+
+def _to_text(values):
+    return np.asarray(values).astype(str).astype(object)
+
+
+# (from type, to type) -> conversion of the raw column values; date values are datetime64 until written.
+CONVERSIONS = {
+    ("int", "float"): lambda values: np.asarray(values, dtype=float),
+    ("int", "string"): _to_text,
+    ("float", "int"): lambda values: np.round(np.asarray(values, dtype=float)).astype(np.int64),
+    ("float", "string"): _to_text,
+    ("bool", "int"): lambda values: np.asarray(values, dtype=np.int64),
+    ("bool", "string"): _to_text,
+    ("string", "category"): lambda values: values,
+    ("category", "string"): lambda values: values,
+    ("date", "string"): format_dates,
+    ("date", "datetime"): lambda values: np.asarray(values, dtype="datetime64[s]"),
+    ("datetime", "string"): format_datetimes,
+    ("datetime", "date"): lambda values: np.asarray(values, dtype="datetime64[D]"),
+}
+
+
+def converter(from_type, to_type):
+    convert = CONVERSIONS.get((from_type, to_type))
+    if convert is None:
+        raise ValueError(f"Cannot retype a {from_type} column to {to_type}")
+    return convert
+
+
+# Compilation
+
+
+def compile_schema(schema):
+    # Validates the schema once and returns build(ids, references, rng) -> DataFrame.
+    declared = set()
+    plan = []
+    for column in schema.columns:
+        missing = [name for name in column.depends if name not in declared]
+        if missing:
+            raise ValueError(f"{schema.name}.{column.name} depends on {missing}, which are not declared before it")
+        if column.name in declared:
+            raise ValueError(f"{schema.name}.{column.name} is declared twice")
+        declared.add(column.name)
+        formatter = {"date": format_dates, "datetime": format_datetimes}.get(column.dtype)
+        plan.append((column.name, column.distribution.sample, column.depends, formatter))
+    output = schema.output_columns
+    if len(set(output)) != len(output):
+        raise ValueError(f"{schema.name} writes a column more than once: {output}")
+    labels = [(column.name, column.label, formatter) for column, (_, _, _, formatter) in zip(schema.columns, plan)
+              if not column.hidden]
+
+    def build(ids, references, rng):
+        batch = Batch(np.asarray(ids), references, rng)
+        for name, sample, depends, _ in plan:
+            batch.values[name] = sample(batch, *(batch.values[dependency] for dependency in depends))
+        frame = {}
+        for name, label, formatter in labels:
+            values = batch.values[name]
+            frame[label] = formatter(values) if formatter is not None else values
+        df = pd.DataFrame(frame, columns=output)
+        # Lets the sink route the batch to the files of the schema version it was built with.
+        df.attrs["schema_version"] = schema.version
+        return df
+
+    return build
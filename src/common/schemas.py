@@ -0,0 +1,253 @@
+import numpy as np
+
+from src.common.dates import add_years, format_dates, random_dates
+from src.common.schema import (Column, Schema, birth_dates, choice, col, compile_schema, constant, dates_between,
+                               datetimes_between, derived, fake, integers, lookup, offset, prefixed, reference,
+                               uniform)
+
+# The entity schemas shared by the initial generators and the automator. Columns that only one of the two
+# former implementations had (shares.TotalValue, loans.LoanPurpose, depots.ValuePerSecurity) are kept, so
+# both write the union of the columns.
+
+LOAN_TYPES = ["Personal", "Mortgage", "Auto", "Business"]
+# Row i holds the sub types of LOAN_TYPES[i]
+LOAN_SUBTYPES = np.array([["Secured", "Unsecured"],
+                          ["Fixed", "Adjustable"],
+                          ["New", "Used"],
+                          ["Small Business", "Corporate"]], dtype=object)
+COLLATERAL_TYPES = ["Property", "Vehicle", "Equipment", "None"]
+LOAN_TERMS = [5, 10, 15, 20, 25, 30]
+LOAN_PURPOSES = ["Home Improvement", "Debt Consolidation", "Business Expansion", "Car Purchase", "Education",
+                 "Medical", "Vacation"]
+
+# (symbol, name, sector, exchange)
+STOCKS = np.array([
+    ("AAPL", "Apple Inc.", "Technology", "NASDAQ"),
+    ("GOOGL", "Alphabet Inc.", "Technology", "NASDAQ"),
+    ("MSFT", "Microsoft Corp.", "Technology", "NASDAQ"),
+    ("AMZN", "Amazon.com Inc.", "Consumer Discretionary", "NASDAQ"),
+    ("TSLA", "Tesla Inc.", "Consumer Discretionary", "NASDAQ"),
+    ("NFLX", "Netflix Inc.", "Communication Services", "NASDAQ"),
+    ("FB", "Meta Platforms", "Communication Services", "NASDAQ"),
+    ("NVDA", "NVIDIA Corp.", "Technology", "NASDAQ"),
+    ("BABA", "Alibaba Group", "Consumer Discretionary", "NYSE"),
+    ("ORCL", "Oracle Corp.", "Technology", "NYSE")
+], dtype=object)
+
+
+def _loan_subtypes(batch, type_index):
+    return LOAN_SUBTYPES[type_index, batch.rng.integers(0, LOAN_SUBTYPES.shape[1], batch.n)]
+
+
+def _collateral_values(batch, collateral_types):
+    return np.where(collateral_types != "None", np.round(batch.rng.uniform(1000, 300000, batch.n), 2), 0.0)
+
+
+def _monthly_payments(batch, amounts, terms):
+    return np.round(amounts / (terms * 12) * batch.rng.uniform(0.9, 1.1, batch.n), 2)
+
+
+def _filing_dates(batch, report_filed):
+    dates = format_dates(random_dates('-3y', 'today', batch.n, batch.rng))
+    return np.where(report_filed, dates, "").astype(object)
+
+
+SCHEMAS = {schema.name: schema for schema in [
+    Schema("customers", "CustomerID", 100000, [
+        Column("FirstName", "string", fake("first_name")),
+        Column("LastName", "string", fake("last_name")),
+        Column("SSN", "string", fake("ssn")),
+        Column("Gender", "category", choice(["Male", "Female"])),
+        Column("DateOfBirth", "date", birth_dates(18, 80)),
+        Column("Email", "string", fake("email")),
+        Column("PhoneNumber", "string", fake("phone_number")),
+        Column("StreetAddress", "string", fake("street_address")),
+        Column("City", "string", fake("city")),
+        Column("State", "string", fake("state")),
+        Column("ZipCode", "string", fake("zipcode")),
+        Column("AccountCreated", "date", dates_between('-10y', 'today')),
+        Column("EmploymentStatus", "category",
+               choice(["Employed", "Unemployed", "Retired", "Student", "Self-Employed"])),
+        Column("Occupation", "string", fake("job")),
+        Column("Employer", "string", fake("company")),
+        Column("AnnualIncome", "category", choice(["<25K", "25K-50K", "50K-100K", "100K-250K", ">250K"])),
+        Column("MaritalStatus", "category", choice(["Single", "Married", "Divorced", "Widowed"])),
+        Column("Nationality", "category",
+               choice(["USA", "Canada", "UK", "Germany", "India", "China", "France", "Australia"])),
+        Column("CreditScore", "int", integers(300, 851)),
+        Column("RiskRating", "int", integers(1, 6)),
+        Column("CustomerSegment", "category", choice(["Retail", "SME", "Corporate", "High Net Worth"])),
+        Column("KYCStatus", "category", choice(["Verified", "Pending", "Not Verified"])),
+        Column("AMLFlag", "bool", choice([True, False])),
+        Column("LoyaltyProgramStatus", "category", choice(["Active", "Inactive", "Not Enrolled"])),
+        Column("RewardPoints", "int", integers(0, 10000)),
+        Column("ChurnProbability", "float", uniform(0, 1)),
+        Column("PreferredBranch", "string", prefixed("BR", 100, 999)),
+        Column("LastLoginDate", "date", dates_between('-1y', 'today')),
+        Column("CustomerRating", "float", uniform(1, 5)),
+    ]),
+    Schema("accounts", "AccountID", 200000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("AccountType", "category", choice(["Savings", "Checking", "Business", "Investment"])),
+        Column("Balance", "float", uniform(-23000, 991234)),
+        Column("OpenedDate", "date", dates_between('-10y', 'today')),
+        Column("Status", "category", choice(["Active", "Inactive", "Closed"])),
+        Column("Currency", "category", choice(["USD", "CAD", "EUR", "GBP"])),
+        Column("BranchCode", "string", prefixed("BR", 100, 999)),
+        Column("InterestRate", "float", uniform(0.1, 5.0)),
+        Column("AccountSubType", "category", choice(["Basic", "Premium", "Gold", "Platinum"])),
+        Column("OverdraftLimit", "float", uniform(0, 5000)),
+        Column("LastTransactionDate", "date", dates_between(col("OpenedDate"), 'today')),
+    ]),
+    Schema("branches", "BranchID", 300000, [
+        Column("BranchName", "string", prefixed("Branch ", 1000, 9999)),
+        Column("StreetAddress", "string", fake("street_address")),
+        Column("City", "string", fake("city")),
+        Column("State", "string", fake("state")),
+        Column("ZipCode", "string", fake("zipcode")),
+        Column("Country", "category", choice(["USA", "Canada", "UK", "Germany", "France", "Australia"])),
+        Column("OperationalHours", "category", constant("9:00-17:00")),
+        Column("TransactionVolume", "int", integers(1000, 10000)),
+        Column("ManagerName", "string", fake("name")),
+        Column("OpeningDate", "date", dates_between('-30y', '-5y')),
+        Column("ContactNumber", "string", fake("phone_number")),
+        Column("NumberOfEmployees", "int", integers(10, 100)),
+        Column("ATMCount", "int", integers(1, 20)),
+    ]),
+    Schema("loans", "LoanID", 400000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("LoanTypeIndex", "int", integers(0, len(LOAN_TYPES)), hidden=True),
+        Column("LoanType", "category", lookup("LoanTypeIndex", LOAN_TYPES)),
+        Column("LoanAmount", "float", uniform(5000, 500000)),
+        Column("InterestRate", "float", uniform(2.5, 10.5)),
+        Column("LoanTermYears", "int", choice(LOAN_TERMS)),
+        Column("ApprovalDate", "date", dates_between('-10y', 'today')),
+        Column("Status", "category", choice(["Active", "Closed", "Default"])),
+        Column("CollateralType", "category", choice(COLLATERAL_TYPES)),
+        Column("CollateralValue", "float", derived(_collateral_values, "CollateralType")),
+        Column("LoanProductSubType", "category", derived(_loan_subtypes, "LoanTypeIndex")),
+        Column("MonthlyPayment", "float", derived(_monthly_payments, "LoanAmount", "LoanTermYears")),
+        Column("OutstandingBalance", "float",
+               derived(lambda batch, amounts: np.round(batch.rng.uniform(0, 1, batch.n) * amounts, 2), "LoanAmount")),
+        Column("LoanPurpose", "category", choice(LOAN_PURPOSES)),
+        Column("LoanStartDate", "date", offset("ApprovalDate", 0, 30, "D")),
+        Column("LoanEndDate", "date",
+               derived(lambda batch, starts, terms: add_years(starts, terms), "LoanStartDate", "LoanTermYears")),
+    ]),
+    Schema("marketing", "CampaignID", 500000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("CampaignType", "category", choice(["Email", "SMS", "Social Media", "Direct Mail"])),
+        Column("CampaignDate", "date", dates_between('-2y', 'today')),
+        Column("Response", "category", choice(["Positive", "Negative", "Neutral", "No Response"])),
+        Column("OfferAccepted", "bool", choice([True, False])),
+        Column("CampaignName", "string", prefixed("Campaign ", 1000, 9999)),
+        Column("CampaignBudget", "float", uniform(1000, 10000)),
+        Column("Impressions", "int", integers(1000, 100000)),
+        Column("Clicks", "int", integers(10, 10000)),
+        Column("ConversionRate", "float", uniform(0, 1)),
+        Column("Cost", "float", uniform(100, 1000)),
+    ]),
+    Schema("digital_interactions", "SessionID", 600000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("LoginTime", "datetime", datetimes_between('-1y', 'now')),
+        Column("DeviceType", "category", choice(["Desktop", "Mobile", "Tablet"])),
+        Column("Browser", "category", choice(["Chrome", "Firefox", "Safari", "Edge", "Opera"])),
+        Column("IPAddress", "string", fake("ipv4")),
+        # Sessions last 5 to 120 minutes
+        Column("LogoutTime", "datetime", offset("LoginTime", 5, 121, "m")),
+    ]),
+    Schema("transactions", "TransactionID", 700000, [
+        Column("AccountID", "int", reference("accounts")),
+        Column("TransactionType", "category", choice(["Deposit", "Withdrawal", "Transfer", "Payment", "Investment"])),
+        Column("Amount", "float", uniform(10, 10000)),
+        Column("TransactionDate", "date", dates_between('-5y', 'today')),
+        Column("Status", "category", choice(["Completed", "Pending", "Failed"])),
+        Column("Channel", "category", choice(["ATM", "Online", "Branch", "Mobile"])),
+        Column("MerchantName", "string", fake("company")),
+        Column("MerchantLocation", "string", fake("city")),
+        Column("TransactionTime", "string", fake("time")),
+        Column("Fee", "float", uniform(0, 50)),
+        Column("ExchangeRate", "float", uniform(0.8, 1.2)),
+        Column("OriginalAmount", "float",
+               derived(lambda batch, amounts, rates: np.round(amounts / rates, 2), "Amount", "ExchangeRate")),
+        Column("CardUsed", "category", choice(["Visa", "MasterCard", "Amex", "Discover", "None"])),
+        Column("POSID", "string", prefixed("POS", 1000, 9999)),
+        Column("Tax", "float",
+               derived(lambda batch, amounts: np.round(amounts * batch.rng.uniform(0, 0.1, batch.n), 2), "Amount")),
+    ]),
+    Schema("risk_alerts", "AlertID", 800000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("RiskType", "category", choice(["Fraud", "Money Laundering", "Cyber Attack", "Regulatory"])),
+        Column("RiskScore", "int", integers(1, 101)),
+        Column("AlertDate", "date", dates_between('-3y', 'today')),
+        Column("ActionTaken", "category", choice(["Investigated", "Resolved", "Pending", "Escalated"])),
+        Column("ComplianceStatus", "category", choice(["Compliant", "Non-Compliant", "Under Review"])),
+    ]),
+    Schema("shares", "ShareID", 900000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("Stock", "int", integers(0, len(STOCKS)), hidden=True),
+        Column("StockSymbol", "category", lookup("Stock", STOCKS[:, 0])),
+        Column("StockName", "category", lookup("Stock", STOCKS[:, 1])),
+        Column("Sector", "category", lookup("Stock", STOCKS[:, 2])),
+        Column("Exchange", "category", lookup("Stock", STOCKS[:, 3])),
+        Column("Quantity", "int", integers(1, 1000)),
+        Column("PurchasePrice", "float", uniform(10, 500)),
+        Column("CurrentPrice", "float", uniform(10, 500)),
+        Column("PurchaseDate", "date", dates_between('-3y', 'today')),
+        Column("TotalValue", "float",
+               derived(lambda batch, quantities, prices: np.round(quantities * prices, 2), "Quantity", "CurrentPrice")),
+    ]),
+    Schema("depots", "DepotID", 1000000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("DepotType", "category", choice(["Standard", "Premium", "Gold"])),
+        Column("OpeningDate", "date", dates_between('-10y', 'today')),
+        Column("Status", "category", choice(["Active", "Inactive", "Closed"])),
+        Column("TotalValue", "float", uniform(1000, 500000)),
+        Column("Custodian", "string", fake("company")),
+        Column("NumberOfSecurities", "int", integers(1, 50)),
+        Column("ValuePerSecurity", "float",
+               derived(lambda batch, values, securities: np.round(values / securities, 2), "TotalValue",
+                       "NumberOfSecurities")),
+    ]),
+    Schema("aml_compliance", "AMLRecordID", 1100000, [
+        Column("CustomerID", "int", reference("customers")),
+        Column("Regulation", "category", choice(["IFRS", "FATCA", "CRS"])),
+        Column("ComplianceStatus", "category", choice(["Compliant", "Non-Compliant", "Under Review"])),
+        Column("InvestigationStatus", "category",
+               choice(["Cleared", "Investigating", "Escalated", "Not Applicable"])),
+        Column("SuspicionScore", "float", uniform(0, 100)),
+        Column("ReportFiled", "bool", choice([True, False])),
+        # Only filed reports have a filing date; the others keep an empty value
+        Column("FilingDate", "string", derived(_filing_dates, "ReportFiled")),
+        Column("HighRiskJurisdiction", "bool", choice([True, False])),
+        Column("OffshoreAccountFlag", "bool", choice([True, False])),
+        Column("Comments", "string", fake("sentence", nb_words=6)),
+        Column("LastUpdated", "date", dates_between('-1y', 'today')),
+    ]),
+]}
+
+_builders = {}
+# (entity, version) -> schema, for every version this process has seen; see set_schema
+_versions = {(name, schema.version): schema for name, schema in SCHEMAS.items()}
+
+
+def set_schema(schema):
+    # Makes an evolved schema the one new batches are built with. Earlier versions stay available, since a
+    # batch built just before a change is still written to (and typed like) its own version's files.
+    _versions[(schema.name, schema.version)] = schema
+    SCHEMAS[schema.name] = schema
+
+
+def schema_version(entity, version=None):
+    if version is None:
+        return SCHEMAS[entity]
+    return _versions.get((entity, version), SCHEMAS[entity])
+
+
+def build_batch(entity, ids, references, rng):
+    # One row of `entity` per ID (see sequence.entity_ids); references maps referenced entities to their IDs.
+    schema = SCHEMAS[entity]
+    builder = _builders.get((entity, schema.version))
+    if builder is None:
+        builder = _builders[(entity, schema.version)] = compile_schema(schema)
+    return builder(ids, references, rng)
@@ -0,0 +1,46 @@
+import os
+import zlib
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RANDOM_SEED = int(os.getenv('RANDOM_SEED', 42))
+
+# Every random stream is addressed by a key such as ("customers", 17), i.e. entity and chunk index. The key is
+# used as the SeedSequence spawn key, so the stream is the one SeedSequence(RANDOM_SEED).spawn() would hand out
+# at that position, but any chunk can be reached directly: chunks are regenerated independently and
+# bit-identically, whichever process or machine produces them.
+
+
+def _key_word(part):
+    if isinstance(part, str):
+        return zlib.crc32(part.encode("utf-8"))
+    return int(part)
+
+
+def seed_sequence(*key):
+    return np.random.SeedSequence(RANDOM_SEED, spawn_key=tuple(_key_word(part) for part in key))
+
+
+def generator(*key):
+    return np.random.Generator(np.random.PCG64(seed_sequence(*key)))
+
+
+def chunk_rng(entity, chunk_index):
+    return generator(entity, chunk_index)
+
+
+def seed_int(*key):
+    # For APIs that only take an integer seed, e.g. Faker.seed_instance
+    return int(seed_sequence(*key).generate_state(1, np.uint64)[0])
+
+
+def seed_faker(faker, *key):
+    faker.seed_instance(seed_int(*key))
+    return faker
+
+
+# Fallback stream for callers that do not pass their own generator
+default_rng = generator("default")
@@ -0,0 +1,162 @@
+import json
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+from logger import log
+
+from src.common.schemas import SCHEMAS
+from src.common.sink import FSYNC_WRITES, file_lock
+
+load_dotenv()
+
+# Entity IDs. Every entity numbers its rows 0, 1, 2, ... (the row's ordinal) and maps the ordinals to IDs in
+# blocks of ID_BLOCK: each entity owns every ID_STRIPES-th block, starting at the block of its id_base. Customers
+# get 100000-199999, then 1200000-1299999, 2300000-2399999, ..., and accounts 200000-299999, 1300000-1399999, ...
+# so no entity runs into the next one's range however many rows it gets, and the first ID_BLOCK rows keep the
+# IDs they always had (id_base + ordinal).
+ID_BLOCK = 100000
+ID_STRIPES = max(schema.id_base // ID_BLOCK for schema in SCHEMAS.values())
+
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+SEQUENCE_DIR = os.path.join(DATA_DIR, "_manifests", "sequences")
+# Ordinals reserved on disk at a time; a crash skips at most this many IDs
+SEQUENCE_BLOCK_SIZE = int(os.getenv("SEQUENCE_BLOCK_SIZE", 10000))
+
+
+def _stripe(entity):
+    return SCHEMAS[entity].id_base // ID_BLOCK
+
+
+def ids_of(entity, ordinals):
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    return (ordinals // ID_BLOCK * ID_STRIPES + _stripe(entity)) * ID_BLOCK + ordinals % ID_BLOCK
+
+
+def entity_ids(entity, start, count):
+    # IDs of rows start .. start + count - 1
+    return ids_of(entity, np.arange(start, start + count, dtype=np.int64))
+
+
+def ordinals_of(entity, ids):
+    ids = np.asarray(ids, dtype=np.int64)
+    return (ids // ID_BLOCK - _stripe(entity)) // ID_STRIPES * ID_BLOCK + ids % ID_BLOCK
+
+
+def ordinal_after(entity, last_id):
+    # First ordinal whose ID is above last_id, for any ID: data written before the sequences numbered its rows
+    # contiguously from id_base (customers 100000-224999), past the entity's first block.
+    block = last_id // ID_BLOCK
+    stripe_block = (block - _stripe(entity)) // ID_STRIPES
+    if stripe_block * ID_STRIPES + _stripe(entity) == block:
+        return stripe_block * ID_BLOCK + last_id % ID_BLOCK + 1
+    return max(stripe_block + 1, 0) * ID_BLOCK
+
+
+class Sequence:
+    """Persistent ordinal counter of one entity, in DATA_DIR/_manifests/sequences/<entity>.json.
+
+    Ordinals are reserved SEQUENCE_BLOCK_SIZE at a time: the end of the reservation is synced to disk before any
+    ordinal of it is handed out, so after a crash the sequence continues behind it and never repeats an ID. The
+    ordinals left unused by a crash are recorded as gaps; a clean stop gives them back instead (release).
+    `written` is the end of the ordinals known to be in their dataset; IDs below it, outside the gaps, exist.
+    Callers serialize access (see IdRegistry)."""
+
+    def __init__(self, entity, directory=SEQUENCE_DIR):
+        self.entity = entity
+        self.path = os.path.join(directory, entity + ".json")
+        state = self._read() or {"reserved": 0, "written": 0, "gaps": []}
+        self.reserved = state["reserved"]
+        self.written = state["written"]
+        self.gaps = [tuple(gap) for gap in state["gaps"]]
+        if self.written < self.reserved:
+            # Ordinals handed out before a restart whose batches never reached the dataset
+            self.gaps.append((self.written, self.reserved))
+            self.written = self.reserved
+            self._write()
+        self.next = self.reserved
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, durable=False):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"entity": self.entity, "reserved": self.reserved, "written": self.written,
+                       "gaps": self.gaps}, f)
+            if durable and FSYNC_WRITES:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def allocate(self, count):
+        # First of `count` new ordinals
+        if self.next + count > self.reserved:
+            with file_lock(self.path):
+                # Another process (e.g. a restarted initial run) may have moved the sequence on
+                state = self._read()
+                if state and state["reserved"] > self.reserved:
+                    if self.next < self.reserved:
+                        self.gaps.append((self.next, self.reserved))
+                    self.written = max(self.written, state["written"])
+                    self.next = self.reserved = state["reserved"]
+                self.reserved = self.next + max(count, SEQUENCE_BLOCK_SIZE)
+                self._write(durable=True)
+        start = self.next
+        self.next += count
+        return start
+
+    def advance(self, end):
+        # Marks ordinals below `end` as used and written, e.g. the rows of the initial datasets
+        if end <= self.reserved and end <= self.written:
+            return
+        with file_lock(self.path):
+            self.reserved = max(self.reserved, end)
+            self.written = max(self.written, end)
+            self.next = max(self.next, end)
+            self._write(durable=True)
+
+    def release(self):
+        # On a clean stop: returns the unused rest of the reservation, so the next start continues at `next`
+        # instead of recording it as a gap
+        if self.next == self.reserved:
+            return
+        with file_lock(self.path):
+            state = self._read()
+            if state and state["reserved"] > self.reserved:
+                # Another process reserved behind this one; its ordinals are not ours to give back
+                return
+            self.reserved = self.next
+            self._write(durable=True)
+
+    def mark_written(self, end):
+        # Not synced: a lost update only keeps some written rows out of existing(), never repeats an ID
+        if end > self.written:
+            self.written = end
+            self._write()
+
+    def existing(self, count, rng):
+        # Up to `count` distinct random ordinals below `written`, outside the gaps. Oversampled a little so that
+        # gaps, deleted IDs and duplicates rarely leave the batch short.
+        if self.written == 0:
+            return np.empty(0, dtype=np.int64)
+        ordinals = np.unique(rng.integers(0, self.written, count + count // 4 + 1))
+        for start, end in self.gaps:
+            ordinals = ordinals[(ordinals < start) | (ordinals >= end)]
+        return ordinals
+
+
+def advance_sequences(row_counts, directory=SEQUENCE_DIR):
+    # Entity -> number of rows in its initial dataset; called once the initial datasets are complete
+    for entity, rows in row_counts.items():
+        Sequence(entity, directory).advance(rows)
+    log.info("ID sequences advanced past the initial data: %s", row_counts)
@@ -0,0 +1,611 @@
+import csv
+import io
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from logger import log
+
+from src.common import metrics, sql_sink
+from src.common.schemas import SCHEMAS, schema_version
+
+# csv | parquet | arrow. CSV datasets are single files; columnar datasets are directories of part files.
+# Arrow parts use the IPC stream format, which (unlike the IPC file format) lets every batch carry its own
+# dictionaries for the categorical columns.
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "csv").lower()
+FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrows"}
+if OUTPUT_FORMAT not in FILE_EXTENSIONS:
+    raise ValueError(f"Unsupported OUTPUT_FORMAT '{OUTPUT_FORMAT}', expected one of {list(FILE_EXTENSIONS)}")
+FILE_EXTENSION = FILE_EXTENSIONS[OUTPUT_FORMAT]
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "snappy")
+# fsync appended batches, automator part files and replaced files before they are committed. Without it a
+# crash can still lose recent batches, but readers never see a partial one.
+FSYNC_WRITES = os.getenv("FSYNC_WRITES", "true").lower() in ("1", "true", "yes")
+# Write automator batches as time partitions, <dataset>/dt=YYYY-MM-DD/batch-<sequence>.<ext>, each one listed in
+# the dataset's manifest (see append_partition) instead of appending to one growing file or directory
+PARTITIONED_OUTPUT = os.getenv("PARTITIONED_OUTPUT", "false").lower() in ("1", "true", "yes")
+# 0 writes one file per batch; otherwise CSV batches within the same window of this many seconds share a file
+PARTITION_WINDOW_SECONDS = int(os.getenv("PARTITION_WINDOW_SECONDS", 0))
+PARTITION_MANIFEST = "_manifest.jsonl"
+PARTITION_WATERMARK = "_watermark.json"
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks on Windows; writers in one process are still serialized by _lock_for.
+    fcntl = None
+
+# One lock per target file so that writers inside the same process never interleave batches.
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+
+def _lock_for(file_path):
+    with _file_locks_guard:
+        return _file_locks.setdefault(os.path.abspath(file_path), threading.Lock())
+
+
+@contextmanager
+def file_lock(file_path, exclusive=True):
+    # Advisory lock on <file>.lock between processes: writers take it exclusively, readers (open_committed)
+    # share it while they look up what to read.
+    if fcntl is None:
+        yield
+        return
+    try:
+        fd = os.open(file_path + ".lock", os.O_RDWR | os.O_CREAT if exclusive else os.O_RDONLY, 0o644)
+    except FileNotFoundError:
+        # No writer has locked this file yet, so there is nothing to wait for
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def _fsync_path(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory):
+    # Makes a rename or a new directory entry durable; some file systems (and Windows) do not support it.
+    try:
+        _fsync_path(directory or ".")
+    except OSError:
+        pass
+
+
+def _committed_path(file_path):
+    return file_path + ".committed"
+
+
+def committed_size(file_path, file_size=None):
+    # Bytes of a CSV dataset that belong to committed batches. Appends record it in the <file>.committed
+    # sidecar; a file without one was published whole by os.replace, so all of it counts.
+    if file_size is None:
+        file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+    try:
+        with open(_committed_path(file_path)) as f:
+            return min(int(f.read()), file_size)
+    except (FileNotFoundError, ValueError):
+        return file_size
+
+
+def _write_committed(file_path, size):
+    tmp_path = _committed_path(file_path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(size))
+        if FSYNC_WRITES:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, _committed_path(file_path))
+
+
+def publish_file(tmp_path, file_path):
+    # Replaces file_path with the complete file at tmp_path. The old sidecar goes first: without one the whole
+    # (old) file counts as committed, and its size would not match the new file.
+    if FSYNC_WRITES:
+        _fsync_path(tmp_path)
+    if os.path.exists(_committed_path(file_path)):
+        os.remove(_committed_path(file_path))
+    os.replace(tmp_path, file_path)
+    if FSYNC_WRITES:
+        _fsync_dir(os.path.dirname(file_path))
+
+
+class _CommittedReader(io.RawIOBase):
+    """Reads an open file up to a size, so that bytes appended after the snapshot are not seen."""
+
+    def __init__(self, f, size):
+        self._f = f
+        self._remaining = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        view = memoryview(buffer)[:self._remaining]
+        read = self._f.readinto(view) if len(view) else 0
+        self._remaining -= read
+        return read
+
+
+@contextmanager
+def open_committed(file_path):
+    # Opens a CSV dataset as a consistent snapshot of its committed batches. The shared lock is only held while
+    # the file and its committed size are looked up: appends never change those bytes, and a rewrite replaces
+    # the file rather than changing the one opened here.
+    with file_lock(file_path, exclusive=False):
+        f = open(file_path, "rb")
+        size = committed_size(file_path, os.fstat(f.fileno()).st_size)
+    with f:
+        yield io.BufferedReader(_CommittedReader(f, size))
+
+
+def read_header(file_path):
+    with open(file_path, "r", newline="") as f:
+        first_line = f.readline()
+    if not first_line:
+        return []
+    return next(csv.reader([first_line]))
+
+
+def _ends_with_newline(file_path):
+    with open(file_path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _append_bytes(file_path, payload):
+    # One O_APPEND write per batch, synced before the batch is committed in the sidecar.
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if FSYNC_WRITES:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _rewrite_with(df, file_path):
+    # Only hit when a batch carries columns the file does not have yet. The widened file is written
+    # next to the original and swapped in, so readers never observe a partially written dataset.
+    updated = pd.concat([pd.read_csv(file_path), df], ignore_index=True)
+    tmp_path = file_path + ".tmp"
+    updated.to_csv(tmp_path, index=False)
+    publish_file(tmp_path, file_path)
+
+
+def dataset_path(data_dir, name):
+    if OUTPUT_FORMAT == "csv":
+        return os.path.join(data_dir, name + ".csv")
+    return os.path.join(data_dir, name)
+
+
+def dataset_name(path):
+    name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+    return re.sub(r"\.v\d+$", "", name)
+
+
+def versioned_path(path, version):
+    # Version 1 of a dataset is the dataset itself. Each schema change starts the next version next to it,
+    # e.g. customers.v2.csv or the customers.v2 directory, so earlier rows are never rewritten.
+    if not version or version == 1:
+        return path
+    if path.endswith(".csv"):
+        return f"{path[:-4]}.v{version}.csv"
+    return f"{os.path.normpath(path)}.v{version}"
+
+
+def dataset_versions(path):
+    # The dataset and the versions started by schema changes, oldest first. A CSV version may exist only as the
+    # directory of its partitions (see append_partition).
+    extension = ".csv" if path.endswith(".csv") else ""
+    base = os.path.normpath(path)
+    directory, name = os.path.split(base[:-len(extension)] if extension else base)
+    pattern = re.compile(re.escape(name) + r"\.v(\d+)(?:\.csv)?")
+    try:
+        entries = os.listdir(directory or ".")
+    except FileNotFoundError:
+        return [path]
+    versions = sorted({int(match.group(1)) for match in map(pattern.fullmatch, entries) if match})
+    return [path] + [os.path.join(directory, f"{name}.v{version}{extension}") for version in versions]
+
+
+def partition_root(path):
+    # Directory of a dataset's partitions: the dataset directory itself, or customers/ next to customers.csv
+    return path[:-4] if path.endswith(".csv") else path
+
+
+def _data_files(directory):
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                  if os.path.splitext(f)[1] in (".csv", ".parquet", ".arrows"))
+
+
+def _version_files(path):
+    files = [path] if path.endswith(".csv") and os.path.exists(path) else []
+    root = partition_root(path)
+    if os.path.isdir(root):
+        if not path.endswith(".csv"):
+            files += _data_files(root)
+        # Partition files are listed by the manifest, in batch order, so a compaction swaps them atomically
+        files += list(dict.fromkeys(os.path.join(root, entry["file"]) for entry in read_manifest(root)))
+    return files
+
+
+def dataset_files(path):
+    return [f for version in dataset_versions(path) for f in _version_files(version)]
+
+
+def _is_text(arrow_type):
+    import pyarrow as pa
+
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+def _columns_of_type(entity, version, dtype):
+    # Storage types for the columnar formats come from the schema version the batch was built with
+    if entity not in SCHEMAS:
+        return []
+    return schema_version(entity, version).columns_of_type(dtype)
+
+
+def to_arrow_table(df, entity):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    version = df.attrs.get("schema_version")
+    # 'YYYY-MM-DD' columns are stored as date32, 'YYYY-MM-DD HH:MM:SS' columns as timestamp[s] and
+    # low-cardinality columns dictionary-encoded.
+    conversions = [(column, lambda values: pc.cast(pc.strptime(values, "%Y-%m-%d", "s"), pa.date32()))
+                   for column in _columns_of_type(entity, version, "date")]
+    conversions += [(column, lambda values: pc.strptime(values, "%Y-%m-%d %H:%M:%S", "s"))
+                    for column in _columns_of_type(entity, version, "datetime")]
+    conversions += [(column, pc.dictionary_encode) for column in _columns_of_type(entity, version, "category")]
+    for column, convert in conversions:
+        index = table.schema.get_field_index(column)
+        if index >= 0 and _is_text(table.schema.field(index).type):
+            table = table.set_column(index, column, convert(table[column]))
+    # The pandas metadata would make readers cast the typed columns back to the generator's string dtypes.
+    return table.replace_schema_metadata(None)
+
+
+class PartWriter:
+    """Streams DataFrame chunks into one part file of OUTPUT_FORMAT, published under its name on close."""
+
+    def __init__(self, path, entity, durable=False):
+        self.path = path
+        self.entity = entity
+        self.durable = durable
+        self.rows = 0
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "w", newline="") if OUTPUT_FORMAT == "csv" else None
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        if self._file is not None:
+            df.to_csv(self._file, index=False, header=self.rows == 0)
+        else:
+            self.write_table(to_arrow_table(df, self.entity))
+            return
+        self.rows += len(df)
+
+    def write_table(self, table):
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_writer(table.schema)
+        # Later chunks follow the first chunk's schema, e.g. a column that happens to be all null.
+        self._writer.write_table(table.cast(self._schema))
+        self.rows += table.num_rows
+
+    def _open_writer(self, schema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if OUTPUT_FORMAT == "parquet":
+            return pq.ParquetWriter(self._tmp_path, schema, compression=PARQUET_COMPRESSION)
+        return pa.ipc.new_stream(self._tmp_path, schema)
+
+    def close(self):
+        writer = self._file or self._writer
+        if writer is None:
+            return
+        writer.close()
+        if self.durable:
+            _fsync_path(self._tmp_path)
+        os.replace(self._tmp_path, self.path)
+        if self.durable:
+            _fsync_dir(os.path.dirname(self.path))
+
+    def abort(self):
+        for writer in (self._file, self._writer):
+            if writer is not None:
+                writer.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _append_part(df, dataset_dir):
+    # Columnar datasets are never rewritten: every batch becomes one new part file of the dataset.
+    os.makedirs(dataset_dir, exist_ok=True)
+    part_name = f"batch-{time.time_ns()}-{os.getpid()}-{threading.get_ident()}{FILE_EXTENSION}"
+    part_path = os.path.join(dataset_dir, part_name)
+    with PartWriter(part_path, dataset_name(dataset_dir), durable=FSYNC_WRITES) as writer:
+        writer.write(df)
+    log.debug("Wrote %d rows to %s", len(df), part_name)
+    return os.path.getsize(part_path)
+
+
+def _append_csv(df, file_path):
+    # Returns the number of bytes added to the file. A batch counts once the sidecar has moved past it, so a
+    # crash mid-append leaves bytes that readers skip and the next writer cuts off.
+    with _lock_for(file_path), file_lock(file_path):
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        committed = committed_size(file_path, size)
+        if committed < size:
+            log.warning("Discarding %d uncommitted bytes at the end of %s.", size - committed, file_path)
+            os.truncate(file_path, committed)
+            size = committed
+        if size == 0:
+            payload = df.to_csv(index=False).encode("utf-8")
+        else:
+            header = read_header(file_path)
+            new_columns = [column for column in df.columns if column not in header]
+            if new_columns:
+                log.warning("Batch for %s introduces columns %s. Rewriting the file once to extend its header.",
+                            file_path, new_columns)
+                _rewrite_with(df, file_path)
+                return os.path.getsize(file_path) - size
+            payload = df.reindex(columns=header).to_csv(index=False, header=False).encode("utf-8")
+            if not _ends_with_newline(file_path):
+                # A file from before the sidecars may end in a row left unfinished by an interrupted writer;
+                # terminate it instead of gluing our first row onto it.
+                payload = b"\n" + payload
+        _append_bytes(file_path, payload)
+        _write_committed(file_path, size + len(payload))
+        log.debug("Appended %d rows to %s", len(df), file_path)
+        return len(payload)
+
+
+def read_watermark(path):
+    # The last published batch of a dataset written with PARTITIONED_OUTPUT, or None before the first one
+    try:
+        with open(os.path.join(partition_root(path), PARTITION_WATERMARK)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _manifest_entries(manifest_path, watermark):
+    with open(manifest_path, "rb") as f:
+        return [json.loads(line) for line in f.read(watermark["manifest_bytes"]).splitlines()]
+
+
+def read_manifest(path):
+    # The manifest entries of the published batches of a partitioned dataset
+    root = partition_root(path)
+    manifest_path = os.path.join(root, PARTITION_MANIFEST)
+    with file_lock(manifest_path, exclusive=False):
+        watermark = read_watermark(root)
+        return _manifest_entries(manifest_path, watermark) if watermark else []
+
+
+def rewrite_manifest(path, update):
+    # Replaces the manifest entries of a partitioned dataset with update(entries), between two batches. The
+    # watermark is moved to the new manifest right after it, and the new manifest is never longer than the old
+    # one, so a loader that still reads the old manifest_bytes sees all of it.
+    root = partition_root(path)
+    manifest_path = os.path.join(root, PARTITION_MANIFEST)
+    with _lock_for(root), file_lock(manifest_path):
+        watermark = read_watermark(root)
+        entries = update(_manifest_entries(manifest_path, watermark))
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        publish_file(tmp_path, manifest_path)
+        _write_watermark(root, dict(watermark, manifest_bytes=os.path.getsize(manifest_path)))
+    return entries
+
+
+def _write_watermark(root, watermark):
+    tmp_path = os.path.join(root, PARTITION_WATERMARK + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(watermark, f, indent=2)
+    publish_file(tmp_path, os.path.join(root, PARTITION_WATERMARK))
+
+
+def append_partition(df, file_path):
+    # One batch as a new file of today's partition (UTC), or appended to the current window's CSV file. A batch
+    # is written in three steps: its file, its line in _manifest.jsonl, then _watermark.json, which is replaced
+    # atomically. Loaders poll the watermark and read the manifest up to its manifest_bytes, so they only ever
+    # see complete batches; each manifest line gives the byte range of its batch within the file.
+    root = partition_root(file_path)
+    extension = ".csv" if file_path.endswith(".csv") else FILE_EXTENSION
+    now = time.time()
+    window = int(now // PARTITION_WINDOW_SECONDS) if PARTITION_WINDOW_SECONDS > 0 else None
+    os.makedirs(root, exist_ok=True)
+    with _lock_for(root), file_lock(os.path.join(root, PARTITION_MANIFEST)):
+        watermark = read_watermark(root) or {"batch": 0, "batches": 0, "rows": 0, "window": None, "manifest_bytes": 0}
+        manifest_path = os.path.join(root, PARTITION_MANIFEST)
+        if os.path.exists(manifest_path) and os.path.getsize(manifest_path) > watermark["manifest_bytes"]:
+            # The line of a batch whose watermark was never written; the batch number is handed out again
+            os.truncate(manifest_path, watermark["manifest_bytes"])
+        batch = watermark["batch"] + 1
+        if extension == ".csv" and window is not None and watermark["window"] == window:
+            # Parquet and Arrow files cannot be appended to, so only CSV windows span several batches
+            relative = watermark["file"]
+            target = os.path.join(root, relative)
+            offset = committed_size(target)
+            written = _append_csv(df, target)
+        else:
+            partition = "dt=" + time.strftime("%Y-%m-%d", time.gmtime(now))
+            relative = os.path.join(partition, f"batch-{batch:08d}{extension}")
+            target = os.path.join(root, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            offset = 0
+            with PartWriter(target, dataset_name(file_path), durable=FSYNC_WRITES) as writer:
+                writer.write(df)
+            written = os.path.getsize(target)
+        committed_at = datetime.fromtimestamp(now, timezone.utc).isoformat(timespec="microseconds")
+        entry = {"batch": batch, "file": relative, "offset": offset, "bytes": written, "rows": len(df),
+                 "schema_version": df.attrs.get("schema_version") or 1, "time": committed_at}
+        _append_bytes(manifest_path, (json.dumps(entry) + "\n").encode("utf-8"))
+        _write_watermark(root, {"dataset": dataset_name(file_path), "batch": batch,
+                                "batches": watermark["batches"] + 1, "rows": watermark["rows"] + len(df),
+                                "file": relative, "window": window, "watermark": committed_at,
+                                "manifest_bytes": os.path.getsize(manifest_path)})
+    log.debug("Wrote batch %d (%d rows) to %s", batch, len(df), target)
+    return written
+
+
+def append_dataframe(df, file_path):
+    if df.empty:
+        return
+    entity = dataset_name(file_path)
+    file_path = versioned_path(file_path, df.attrs.get("schema_version"))
+    with metrics.stage(entity, "write"):
+        if sql_sink.enabled():
+            # One transaction per batch; the database does not report the bytes it writes
+            sql_sink.append(df, file_path)
+            written = 0
+        elif PARTITIONED_OUTPUT:
+            written = append_partition(df, file_path)
+        elif file_path.endswith(".csv"):
+            written = _append_csv(df, file_path)
+        else:
+            written = _append_part(df, file_path)
+    metrics.inc("datagen_rows_total", len(df), entity=entity)
+    metrics.inc("datagen_bytes_written_total", written, entity=entity)
+
+
+def read_part(file_path, columns=None):
+    # One Parquet or Arrow part as a pyarrow Table; `columns` that a part lacks are skipped
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if file_path.endswith(".parquet"):
+        if columns:
+            # Parts written before a schema change may lack some of the columns
+            names = pq.read_schema(file_path).names
+            columns = [column for column in columns if column in names]
+        return pq.read_table(file_path, columns=columns)
+    with pa.memory_map(file_path) as source:
+        table = pa.ipc.open_stream(source).read_all()
+    return table.select([column for column in columns if column in table.column_names]) if columns else table
+
+
+def _part_rows(file_path):
+    import pyarrow.parquet as pq
+
+    if file_path.endswith(".parquet"):
+        # Row counts live in the footer; no data pages are read.
+        return pq.ParquetFile(file_path).metadata.num_rows
+    return read_part(file_path).num_rows
+
+
+def read_column(path, column):
+    if sql_sink.enabled():
+        with metrics.stage(dataset_name(path), "read"):
+            return sql_sink.read_column(path, column)
+    files = dataset_files(path)
+    if not files:
+        return np.empty(0, dtype=np.int64)
+    with metrics.stage(dataset_name(path), "read"):
+        if path.endswith(".csv"):
+            return np.concatenate([_read_csv_column(f, column) for f in files])
+        return np.concatenate([read_part(f, [column])[column].to_numpy() for f in files])
+
+
+def _read_csv_column(file_path, column):
+    with open_committed(file_path) as f:
+        # Parse only the requested column; the C parser skips the others without converting them.
+        return pd.read_csv(f, usecols=[column])[column].to_numpy()
+
+
+def read_snapshot(path, columns=None):
+    # The committed rows of a dataset and its schema versions as one DataFrame, consistent while writers keep
+    # appending: CSV files are read up to their committed size, and columnar datasets only list published parts.
+    if sql_sink.enabled():
+        return sql_sink.read_snapshot(path, columns)
+    frames = []
+    for file_path in dataset_files(path):
+        if file_path.endswith(".csv"):
+            with open_committed(file_path) as f:
+                frames.append(pd.read_csv(f, usecols=(lambda name: name in columns) if columns else None))
+        else:
+            frames.append(read_part(file_path, columns).to_pandas())
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _csv_rows(file_path):
+    lines = 0
+    with open_committed(file_path) as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            lines += block.count(b"\n")
+    return max(lines - 1, 0)
+
+
+def count_rows(path):
+    if sql_sink.enabled():
+        return sql_sink.count_rows(path)
+    if not path.endswith(".csv"):
+        return sum(_part_rows(f) for f in dataset_files(path))
+    return sum(_csv_rows(f) for f in dataset_files(path))
+
+
+def _csv_has_rows(file_path):
+    with open_committed(file_path) as f:
+        # We assume the file has a header; at least one data row means a non-empty second line.
+        f.readline()
+        return f.readline().strip() != b""
+
+
+def has_rows(path):
+    if sql_sink.enabled():
+        return sql_sink.has_rows(path)
+    if not path.endswith(".csv"):
+        return any(_part_rows(f) > 0 for f in dataset_files(path))
+    return any(_csv_has_rows(f) for f in dataset_files(path))
+
+
+def dataset_exists(path):
+    if sql_sink.enabled():
+        return bool(sql_sink.dataset_tables(path))
+    return bool(dataset_files(path))
+
+
+def max_id(path, column):
+    # Highest ID of a dataset, or None while it is empty; a primary key lookup in the database backends
+    if sql_sink.enabled():
+        return sql_sink.max_id(path, column)
+    ids = read_column(path, column)
+    return int(ids.max()) if len(ids) else None
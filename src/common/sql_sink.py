@@ -0,0 +1,256 @@
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from logger import log
+
+from src.common.schemas import SCHEMAS
+
+load_dotenv()
+
+# Embedded database backend of the sink. With SINK_BACKEND=sqlite or duckdb every dataset is a table of
+# SINK_DATABASE instead of a file: customers.csv (or the customers directory) becomes the table customers, its
+# schema versions customers_v2, ..., and CDC streams customers_cdc. An entity's ID column is the table's primary
+# key, so ID lookups are index seeks. The initial run still writes its chunks as part files in parallel
+# (OUTPUT_FORMAT) and loads them into the table when it combines them.
+
+SINK_BACKEND = os.getenv("SINK_BACKEND", "files").lower()
+if SINK_BACKEND not in ("files", "sqlite", "duckdb"):
+    raise ValueError(f"Unsupported SINK_BACKEND '{SINK_BACKEND}', expected files, sqlite or duckdb")
+if SINK_BACKEND == "duckdb":
+    # Optional dependency: checked at start-up rather than at the first write
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("SINK_BACKEND=duckdb needs the duckdb package, which is not installed; "
+                          "install it with `pip install duckdb`") from None
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+SINK_DATABASE = os.getenv("SINK_DATABASE", os.path.join(DATA_DIR, f"datagen.{SINK_BACKEND}"))
+# Rows per insert statement when part files are loaded
+SINK_INSERT_ROWS = int(os.getenv("SINK_INSERT_ROWS", 50000))
+# Seconds a SQLite writer waits for another one to commit
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 60))
+
+
+def enabled():
+    return SINK_BACKEND != "files"
+
+
+class ConnectionPool:
+    """Connections to one database, shared by the generator threads; a connection is used by one thread at a
+    time and returned for the next. DuckDB allows one writing process per file, so its connections are cursors
+    of a single database handle."""
+
+    def __init__(self, database, backend):
+        self.database = database
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._idle = []
+        self._handle = None
+        self._pid = os.getpid()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.database)), exist_ok=True)
+        if self.backend == "sqlite":
+            # Transactions are opened explicitly (see transaction)
+            connection = sqlite3.connect(self.database, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None,
+                                         check_same_thread=False)
+            # WAL lets readers query while a batch is being inserted
+            connection.execute("PRAGMA journal_mode=WAL")
+            return connection
+        if self._handle is None:
+            self._handle = duckdb.connect(self.database)
+        return self._handle.cursor()
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections do not survive a fork; a worker process opens its own
+                self._idle, self._handle, self._pid = [], None, os.getpid()
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                self._idle.append(connection)
+
+
+_pool = ConnectionPool(SINK_DATABASE, SINK_BACKEND)
+# Tables are created and widened by one thread at a time; DuckDB rejects concurrent catalog changes.
+_ddl_lock = threading.Lock()
+
+
+@contextmanager
+def transaction():
+    with _pool.connection() as connection:
+        # IMMEDIATE takes SQLite's write lock up front, so two writers never deadlock upgrading a read lock
+        connection.execute("BEGIN IMMEDIATE" if SINK_BACKEND == "sqlite" else "BEGIN TRANSACTION")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+def table_name(path):
+    # customers.csv, the customers directory and customers.v2.csv -> customers, customers and customers_v2
+    name = re.sub(r"\.(csv|parquet|arrows)$", "", os.path.basename(os.path.normpath(path)))
+    name = re.sub(r"\.v(\d+)$", r"_v\1", name)
+    if not re.fullmatch(r"\w+", name):
+        raise ValueError(f"Cannot store dataset {path} as a table")
+    return name
+
+
+def _entity(table):
+    # Entity of a table and whether the table holds its rows (rather than CDC events)
+    name = re.sub(r"_v\d+$", "", table)
+    if name in SCHEMAS:
+        return name, True
+    name = re.sub(r"_cdc$", "", name)
+    return (name, False) if name in SCHEMAS else (None, False)
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _tables(connection):
+    if SINK_BACKEND == "sqlite":
+        rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    else:
+        rows = connection.execute("SELECT table_name FROM information_schema.tables").fetchall()
+    return {row[0] for row in rows}
+
+
+def dataset_tables(path):
+    # The dataset's table and those of its schema versions, oldest first
+    name = table_name(path)
+    pattern = re.compile(re.escape(name) + r"(?:_v(\d+))?")
+    with _pool.connection() as connection:
+        matches = [(pattern.fullmatch(table), table) for table in _tables(connection)]
+    versions = sorted((int(match.group(1) or 1), table) for match, table in matches if match)
+    return [table for _, table in versions]
+
+
+def _columns(connection, table):
+    cursor = connection.execute(f"SELECT * FROM {_quote(table)} LIMIT 0")
+    return [column[0] for column in cursor.description]
+
+
+def _sql_type(values):
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "boolean":
+        return "BOOLEAN"
+    if kind == "integer":
+        # INTEGER PRIMARY KEY is SQLite's rowid; DuckDB's INTEGER is only 32 bits wide
+        return "INTEGER" if SINK_BACKEND == "sqlite" else "BIGINT"
+    if kind in ("floating", "mixed-integer-float", "decimal"):
+        return "DOUBLE"
+    return "TEXT"
+
+
+def _ensure_table(connection, table, df):
+    # Creates the table from the first batch; columns added by later batches are appended to it.
+    with _ddl_lock:
+        if table not in _tables(connection):
+            entity, rows = _entity(table)
+            id_column = SCHEMAS[entity].id_column if entity else None
+            definitions = [f"{_quote(column)} {_sql_type(df[column])}" + (
+                " PRIMARY KEY" if rows and column == id_column else "") for column in df.columns]
+            connection.execute(f"CREATE TABLE {_quote(table)} ({', '.join(definitions)})")
+            if id_column in df.columns and not rows:
+                # CDC events: several per ID, so an index instead of a key
+                connection.execute(f"CREATE INDEX {_quote(table + '_id')} ON {_quote(table)} ({_quote(id_column)})")
+            log.info("Created table %s in %s", table, SINK_DATABASE)
+            return
+        existing = _columns(connection, table)
+        for column in df.columns:
+            if column not in existing:
+                log.warning("Batch for %s introduces column %s; adding it to the table.", table, column)
+                connection.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {_sql_type(df[column])}")
+
+
+def _insert(connection, table, df):
+    columns = ", ".join(_quote(column) for column in df.columns)
+    if SINK_BACKEND == "duckdb":
+        # DuckDB scans the DataFrame directly (via Arrow) instead of binding row by row
+        view = f"batch_{threading.get_ident()}"
+        connection.register(view, df)
+        try:
+            connection.execute(f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} FROM {view}")
+        finally:
+            connection.unregister(view)
+        return
+    placeholders = ", ".join("?" for _ in df.columns)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    connection.executemany(f"INSERT INTO {_quote(table)} ({columns}) VALUES ({placeholders})", rows)
+
+
+def append(df, path):
+    # One batch in one transaction
+    table = table_name(path)
+    with transaction() as connection:
+        _ensure_table(connection, table, df)
+        _insert(connection, table, df)
+    log.debug("Inserted %d rows into %s", len(df), table)
+
+
+def load(frames, path):
+    # Replaces the dataset's table with the rows of `frames`, in one transaction: readers see the old table
+    # until the whole dataset is in, and an interrupted load leaves no partial table behind.
+    table = table_name(path)
+    rows = 0
+    with transaction() as connection:
+        connection.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        for df in frames:
+            if rows == 0:
+                _ensure_table(connection, table, df)
+            _insert(connection, table, df)
+            rows += len(df)
+    return rows
+
+
+def _query(sql, *parameters):
+    with _pool.connection() as connection:
+        return connection.execute(sql, parameters).fetchall()
+
+
+def read_column(path, column):
+    values = [np.array([row[0] for row in _query(f"SELECT {_quote(column)} FROM {_quote(table)}")])
+              for table in dataset_tables(path)]
+    return np.concatenate(values) if values else np.empty(0, dtype=np.int64)
+
+
+def read_snapshot(path, columns=None):
+    frames = []
+    for table in dataset_tables(path):
+        with _pool.connection() as connection:
+            names = [name for name in _columns(connection, table) if not columns or name in columns]
+            rows = connection.execute(f"SELECT {', '.join(map(_quote, names))} FROM {_quote(table)}").fetchall()
+        frames.append(pd.DataFrame(rows, columns=names))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def count_rows(path):
+    return sum(_query(f"SELECT count(*) FROM {_quote(table)}")[0][0] for table in dataset_tables(path))
+
+
+def has_rows(path):
+    return any(_query(f"SELECT 1 FROM {_quote(table)} LIMIT 1") for table in dataset_tables(path))
+
+
+def max_id(path, column):
+    # Read from the primary key index
+    values = [_query(f"SELECT max({_quote(column)}) FROM {_quote(table)}")[0][0] for table in dataset_tables(path)]
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
@@ -1,9 +1,10 @@
 import os
 
-import numpy as np
 from dotenv import load_dotenv
 from faker import Faker
 
+from src.common.fast_faker import VectorFaker
+
 load_dotenv()
 
 SCALE_FACTOR = int(os.getenv('SCALE_FACTOR', 50))
@@ -18,6 +19,5 @@ TEMP_DATA_DIR = os.getenv("TEMP_DATA_DIR", "synthetic_bank_data")
 
 # Create a shared Faker instance
 fake = Faker(['it_IT', 'en_US', 'de_AT', 'de_DE', 'de_CH'])
-
-# Set a common random seed
-np.random.seed(42)
+# Vectorized view over the same locales for bulk columns; its pools are seeded from RANDOM_SEED (see seeding.py)
+vfake = VectorFaker(fake)
@@ -0,0 +1,127 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from logger import log
+
+from src.common import metrics
+from src.common.schemas import SCHEMAS, build_batch
+from src.common.seeding import generator
+from src.common.sink import append_dataframe, dataset_path
+from src.data_automator.id_registry import registry
+
+load_dotenv()
+
+# Change-data-capture events for rows that already exist: updates of some attributes and deletes. Each entity
+# has its own stream, e.g. customers_cdc.csv, with one row per event: Op (U or D), the entity's ID, ChangeTime,
+# ChangedColumns ('|' separated) and the new values of the entity's updatable columns, empty where unchanged.
+# Keys come from the ID registry, so neither the datasets nor the streams are ever read back.
+
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+# Share of the events that delete their row
+CDC_DELETE_FRACTION = float(os.getenv("CDC_DELETE_FRACTION", 0.05))
+# Most column groups one update changes
+CDC_MAX_CHANGED_GROUPS = int(os.getenv("CDC_MAX_CHANGED_GROUPS", 2))
+
+# Entity -> groups of columns that change together, e.g. an address. New values are drawn from the columns'
+# distributions in the entity schema, for all columns of a group from one new row, so a derived column is only
+# updated together with the columns it is derived from (see _check_groups).
+UPDATABLE_COLUMNS = {
+    "customers": [("Email",), ("PhoneNumber",), ("StreetAddress", "City", "State", "ZipCode"),
+                  ("EmploymentStatus", "Occupation", "Employer", "AnnualIncome"), ("MaritalStatus",),
+                  ("CreditScore", "RiskRating"), ("CustomerSegment",), ("KYCStatus",), ("AMLFlag",),
+                  ("LoyaltyProgramStatus", "RewardPoints"), ("ChurnProbability",), ("LastLoginDate",),
+                  ("CustomerRating",)],
+    "accounts": [("Balance", "LastTransactionDate"), ("Status",), ("InterestRate",), ("AccountSubType",),
+                 ("OverdraftLimit",)],
+    "loans": [("Status",), ("InterestRate",), ("CollateralType", "CollateralValue")],
+    "marketing": [("Response", "OfferAccepted"), ("Impressions", "Clicks", "ConversionRate"), ("Cost",)],
+    "digital_interactions": [("IPAddress",)],
+    "transactions": [("Status",), ("Fee",)],
+    "risk_alerts": [("RiskScore",), ("ActionTaken", "ComplianceStatus")],
+    "shares": [("Quantity", "CurrentPrice", "TotalValue")],
+    "depots": [("Status",), ("TotalValue", "NumberOfSecurities", "ValuePerSecurity")],
+    "aml_compliance": [("ComplianceStatus", "InvestigationStatus"), ("SuspicionScore",),
+                       ("ReportFiled", "FilingDate"), ("Comments", "LastUpdated")],
+}
+# Entity -> columns set to the date of the change rather than drawn: a balance change is a transaction today,
+# which is never before the account was opened.
+CHANGE_DATE_COLUMNS = {"accounts": ("LastTransactionDate",)}
+
+
+def _check_groups():
+    for entity, groups in UPDATABLE_COLUMNS.items():
+        columns = {column.name: column for column in SCHEMAS[entity].columns}
+        for group in groups:
+            for name in group:
+                missing = [dependency for dependency in columns[name].depends if dependency not in group]
+                if missing and name not in CHANGE_DATE_COLUMNS.get(entity, ()):
+                    raise ValueError(f"CDC updates {entity}.{name} without {missing}, which it is derived from")
+
+
+_check_groups()
+
+
+def cdc_path(entity):
+    return dataset_path(DATA_DIR, entity + "_cdc")
+
+
+def _current_groups(schema, groups):
+    # Maps the declared column names to what the current schema version writes them as; columns dropped by a
+    # schema change are no longer updated.
+    labels = {column.name.partition("@")[0]: column.label for column in schema.columns if not column.hidden}
+    current = [tuple(labels[name] for name in group if name in labels) for group in groups]
+    return [group for group in current if group]
+
+
+def build_cdc_events(entity, keys, rng):
+    schema = SCHEMAS[entity]
+    groups = _current_groups(schema, UPDATABLE_COLUMNS[entity])
+    columns = list(dict.fromkeys(label for group in groups for label in group))
+    n = len(keys)
+    # An entity whose updatable columns were all dropped by schema changes only gets deletes
+    deletes = rng.random(n) < CDC_DELETE_FRACTION if groups else np.ones(n, dtype=bool)
+    references = {name: registry.live_ids(name) for name in schema.references}
+    values = build_batch(entity, keys, references, rng)
+    now = datetime.now()
+    for column in schema.columns:
+        if not column.hidden and column.name.partition("@")[0] in CHANGE_DATE_COLUMNS.get(entity, ()):
+            values[column.label] = now.strftime("%Y-%m-%d %H:%M:%S" if column.dtype == "datetime" else "%Y-%m-%d")
+    # Each update changes 1..CDC_MAX_CHANGED_GROUPS of the groups, picked at random
+    changed_counts = rng.integers(1, min(CDC_MAX_CHANGED_GROUPS, max(len(groups), 1)) + 1, n)
+    ranks = np.argsort(rng.random((n, len(groups))), axis=1).argsort(axis=1)
+    group_changed = (ranks < changed_counts[:, None]) & ~deletes[:, None]
+    events = pd.DataFrame({
+        "Op": np.where(deletes, "D", "U"),
+        schema.id_column: keys,
+        "ChangeTime": now.isoformat(sep=" ", timespec="microseconds"),
+    })
+    changed = {label: np.zeros(n, dtype=bool) for label in columns}
+    for index, group in enumerate(groups):
+        for label in group:
+            changed[label] |= group_changed[:, index]
+    events["ChangedColumns"] = ["|".join(label for label in columns if changed[label][row]) for row in range(n)]
+    for label in columns:
+        events[label] = values[label].astype(object).where(changed[label], None)
+    # Written next to the schema version whose columns the events carry; see schema_evolution
+    events.attrs["schema_version"] = schema.version
+    return events
+
+
+def generate_cdc_batch(entity, batch_size):
+    rng = generator(entity, "cdc", time.time_ns())
+    keys = registry.existing_ids(entity, batch_size, rng)
+    if len(keys) == 0:
+        log.warning("No %s rows to change yet.", entity)
+        return 0
+    with metrics.stage(entity + "_cdc", "build"):
+        events = build_cdc_events(entity, keys, rng)
+    append_dataframe(events, cdc_path(entity))
+    deleted = keys[events["Op"].to_numpy() == "D"]
+    if len(deleted):
+        registry.delete_ids(entity, deleted)
+    log.debug("%s: %d CDC events, %d deletes", entity, len(events), len(deleted))
+    return len(events)
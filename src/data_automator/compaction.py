@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from dotenv import load_dotenv
+from logger import log
+
+from src.common import metrics
+from src.common.schemas import SCHEMAS
+from src.common.sink import (FSYNC_WRITES, PARTITION_WATERMARK, PartWriter, dataset_name, open_committed,
+                             publish_file, read_manifest, read_part, read_watermark, rewrite_manifest)
+from src.data_automator.scheduler import Job
+
+load_dotenv()
+
+# Compaction of partitioned automator output (PARTITIONED_OUTPUT): the small batch files of each dt=
+# partition are merged into files of about COMPACTION_TARGET_BYTES, sorted by ID. Merged files are written next
+# to the batches and swapped in by rewriting the manifest, which only holds the dataset's lock for that step,
+# so the generators keep writing meanwhile. The replaced batch files are removed one COMPACTION_LAG_SECONDS
+# later, when no reader that listed them before the swap can still be reading them.
+
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+# Run every COMPACTION_INTERVAL_SECONDS inside the automator; 0 disables the job (see also main below)
+COMPACTION_INTERVAL_SECONDS = int(os.getenv("COMPACTION_INTERVAL_SECONDS", 0))
+# Size of the merged files; files this large are left alone
+COMPACTION_TARGET_BYTES = int(os.getenv("COMPACTION_TARGET_BYTES", 128 * 1024 * 1024))
+# Only batches published at least this long ago are merged, so loaders polling the watermark read them first
+COMPACTION_LAG_SECONDS = int(os.getenv("COMPACTION_LAG_SECONDS", 600))
+# Files replaced by a compaction and the time they were replaced, one JSON object per line
+SUPERSEDED_FILES = "_superseded.jsonl"
+
+
+def partitioned_datasets(data_dir=DATA_DIR):
+    # Partition roots of the datasets, schema versions and CDC streams written with PARTITIONED_OUTPUT
+    if not os.path.isdir(data_dir):
+        return []
+    roots = [os.path.join(data_dir, entry) for entry in sorted(os.listdir(data_dir))]
+    return [root for root in roots if os.path.exists(os.path.join(root, PARTITION_WATERMARK))]
+
+
+def _id_column(root):
+    # CDC streams (accounts_cdc) are sorted by the ID of the entity they change
+    name = dataset_name(root)
+    schema = SCHEMAS.get(name) or SCHEMAS.get(name[:-len("_cdc")] if name.endswith("_cdc") else name)
+    return schema.id_column if schema else None
+
+
+def plan_compaction(entries, current_file, cutoff, target_bytes=COMPACTION_TARGET_BYTES):
+    # Groups of at least two small files of the same partition, in batch order, of at most target_bytes each.
+    # The file of the latest batch may still grow (PARTITION_WINDOW_SECONDS) and is never merged.
+    files = {}
+    for entry in entries:
+        files.setdefault(entry["file"], []).append(entry)
+    groups = []
+    group, group_bytes = [], 0
+    for file, file_entries in files.items():
+        size = sum(entry["bytes"] for entry in file_entries)
+        eligible = (file != current_file and size < target_bytes
+                    and all(entry["time"] <= cutoff for entry in file_entries))
+        same_partition = group and os.path.dirname(group[-1]) == os.path.dirname(file)
+        if group and (not eligible or not same_partition or group_bytes + size > target_bytes):
+            groups.append(group)
+            group, group_bytes = [], 0
+        if eligible:
+            group.append(file)
+            group_bytes += size
+    groups.append(group)
+    return [group for group in groups if len(group) > 1]
+
+
+def _merge(root, files, target, id_column):
+    # Writes the rows of `files` sorted by ID to `target`. The sort is stable, so events for the same ID in a CDC
+    # stream keep their order.
+    paths = [os.path.join(root, file) for file in files]
+    if target.endswith(".csv"):
+        frames = []
+        for path in paths:
+            with open_committed(path) as f:
+                # As text, so every value is written back exactly as it was
+                frames.append(pd.read_csv(f, dtype=str, keep_default_na=False))
+        df = pd.concat(frames, ignore_index=True)
+        if id_column in df.columns:
+            df = df.iloc[pd.to_numeric(df[id_column]).argsort(kind="stable")]
+        tmp_path = target + ".tmp"
+        df.to_csv(tmp_path, index=False)
+        publish_file(tmp_path, target)
+        return len(df)
+    import pyarrow as pa
+
+    table = pa.concat_tables([read_part(path) for path in paths], promote_options="permissive")
+    if id_column in table.column_names:
+        table = table.sort_by(id_column)
+    with PartWriter(target, dataset_name(root), durable=FSYNC_WRITES) as writer:
+        writer.write_table(table)
+    return table.num_rows
+
+
+def compact_dataset(root, lag_seconds=COMPACTION_LAG_SECONDS, target_bytes=COMPACTION_TARGET_BYTES):
+    # Returns the number of batch files merged away
+    remove_superseded(root, lag_seconds)
+    watermark = read_watermark(root)
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=lag_seconds)).isoformat(timespec="microseconds")
+    manifest = read_manifest(root)
+    groups = plan_compaction(manifest, watermark["file"], cutoff, target_bytes)
+    if not groups:
+        return 0
+    entries = {}
+    for entry in manifest:
+        entries.setdefault(entry["file"], []).append(entry)
+    id_column = _id_column(root)
+    merged = {}
+    for files in groups:
+        first = entries[files[0]][0].get("first_batch", entries[files[0]][0]["batch"])
+        last = entries[files[-1]][-1]
+        extension = os.path.splitext(files[0])[1]
+        file = os.path.join(os.path.dirname(files[0]), f"compacted-{first:08d}-{last['batch']:08d}{extension}")
+        # Not listed in the manifest yet, so no reader sees the merged file until the swap below
+        with metrics.stage(dataset_name(root), "compact"):
+            rows = _merge(root, files, os.path.join(root, file), id_column)
+        merged[file] = (files, {"batch": last["batch"], "first_batch": first, "file": file, "offset": 0,
+                                "bytes": os.path.getsize(os.path.join(root, file)), "rows": rows,
+                                "schema_version": last["schema_version"], "time": last["time"], "compacted": True})
+
+    def swap(current):
+        listed = {entry["file"] for entry in current}
+        # Only the groups whose batch files are all still listed are swapped in
+        swapped = [(files, entry) for files, entry in merged.values() if listed.issuperset(files)]
+        replaced = {file for files, _ in swapped for file in files}
+        kept = [entry for entry in current if entry["file"] not in replaced]
+        return sorted(kept + [entry for _, entry in swapped], key=lambda entry: entry["batch"])
+
+    listed = {entry["file"] for entry in rewrite_manifest(root, swap)}
+    superseded = [file for files, _ in merged.values() for file in files if file not in listed]
+    with open(os.path.join(root, SUPERSEDED_FILES), "a") as f:
+        f.writelines(json.dumps({"file": file, "time": time.time()}) + "\n" for file in superseded)
+    log.info("%s: compacted %d files into %d", os.path.basename(root), len(superseded), len(listed & set(merged)))
+    return len(superseded)
+
+
+def remove_superseded(root, lag_seconds=COMPACTION_LAG_SECONDS):
+    path = os.path.join(root, SUPERSEDED_FILES)
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        superseded = [json.loads(line) for line in f if line.strip()]
+    remaining = []
+    for entry in superseded:
+        if time.time() - entry["time"] < lag_seconds:
+            remaining.append(entry)
+            continue
+        for file in (entry["file"], entry["file"] + ".committed", entry["file"] + ".lock"):
+            if os.path.exists(os.path.join(root, file)):
+                os.remove(os.path.join(root, file))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(json.dumps(entry) + "\n" for entry in remaining)
+    os.replace(tmp_path, path)
+
+
+def compact_all(data_dir=DATA_DIR, lag_seconds=COMPACTION_LAG_SECONDS, target_bytes=COMPACTION_TARGET_BYTES):
+    merged = 0
+    for root in partitioned_datasets(data_dir):
+        try:
+            merged += compact_dataset(root, lag_seconds, target_bytes)
+        except (OSError, ValueError) as e:
+            # The merged files stay unlisted; the next run plans the same groups again
+            log.error("Compaction of %s failed: %s", root, e)
+    return merged
+
+
+class CompactionJob(Job):
+    """Compacts the partitioned datasets every COMPACTION_INTERVAL_SECONDS."""
+
+    def __init__(self, interval=COMPACTION_INTERVAL_SECONDS):
+        super().__init__("compaction", None, interval, interval, 1)
+
+    def run_once(self):
+        self.rows += compact_all()
+        self.batches += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge the small partition files of the automator's datasets.")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="data directory the automator writes to")
+    parser.add_argument("--interval", type=int, default=COMPACTION_INTERVAL_SECONDS or 300,
+                        help="seconds between runs")
+    parser.add_argument("--once", action="store_true", help="compact once and exit")
+    args = parser.parse_args(argv)
+    while True:
+        log.info("Compacted %d files.", compact_all(args.data_dir))
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
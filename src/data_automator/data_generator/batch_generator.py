@@ -0,0 +1,63 @@
+import os
+
+from dotenv import load_dotenv
+from logger import log
+
+from src.common import metrics
+from src.common.schemas import SCHEMAS, build_batch
+from src.common.seeding import generator
+from src.common.sink import append_dataframe, dataset_path
+from src.data_automator.id_registry import LIVE_ENTITIES, registry
+
+load_dotenv()
+
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+
+# Entity -> suffix of its MIN_SLEEP_TIME_/MAX_SLEEP_TIME_/MAX_BATCH_/RATE_/CDC_RATE_ variables and the defaults of
+# the first three. RATE_ (rows/s in firehose mode) and CDC_RATE_ (events/s) default to 0, i.e. off.
+BATCH_DEFAULTS = {
+    "customers": ("CUSTOMERS", 300, 600, 100),
+    "accounts": ("ACCOUNTS", 180, 300, 50),
+    "loans": ("LOANS", 600, 900, 20),
+    "marketing": ("MARKETING", 120, 240, 10),
+    "digital_interactions": ("DIGITAL", 30, 120, 200),
+    "risk_alerts": ("RISK_ALERTS", 300, 600, 50),
+    "shares": ("SHARES", 60, 180, 100),
+    "depots": ("DEPOTS", 600, 900, 20),
+    "aml_compliance": ("AML", 900, 1800, 30),
+    "transactions": ("TRANSACTIONS", 5, 30, 1000),
+}
+
+
+def _settings(suffix, min_sleep, max_sleep, max_batch):
+    return {"min_sleep": int(os.getenv("MIN_SLEEP_TIME_" + suffix, min_sleep)),
+            "max_sleep": int(os.getenv("MAX_SLEEP_TIME_" + suffix, max_sleep)),
+            "max_batch": int(os.getenv("MAX_BATCH_" + suffix, max_batch)),
+            "rate": float(os.getenv("RATE_" + suffix, 0)),
+            "cdc_rate": float(os.getenv("CDC_RATE_" + suffix, 0))}
+
+
+# Entity -> its batch settings, in the order the automator's jobs start
+BATCH_SETTINGS = {entity: _settings(*defaults) for entity, defaults in BATCH_DEFAULTS.items()}
+
+
+def generate_batch(entity, batch_size):
+    # One batch of new rows of the entity from its schema; returns the number of rows written.
+    references = {}
+    for name in SCHEMAS[entity].references:
+        references[name] = registry.live_ids(name)
+        if len(references[name]) == 0:
+            log.error("%s file missing! Generate %s first.", name.capitalize(), name)
+            return 0
+    new_ids = registry.next_ids(entity, batch_size)
+    with metrics.stage(entity, "build"):
+        rng = generator(entity, "batch", int(new_ids[0]))
+        batch = build_batch(entity, new_ids, references, rng)
+    log.debug("New %s batch shape: %s", entity, batch.shape)
+    append_dataframe(batch, dataset_path(DATA_DIR, entity))
+    if entity in LIVE_ENTITIES:
+        # Later batches of other entities reference these
+        registry.add_live_ids(entity, new_ids)
+    else:
+        registry.mark_written(entity, new_ids)
+    return batch_size
@@ -0,0 +1,152 @@
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+from logger import log
+
+from src.common.schemas import SCHEMAS
+from src.common.sequence import SEQUENCE_DIR, Sequence, ids_of, ordinal_after, ordinals_of
+from src.common.sink import dataset_exists, dataset_path, max_id, read_column
+
+load_dotenv()
+
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+
+# Entity -> (dataset name, ID column, ID base; see sequence); branches are only generated initially.
+ENTITY_IDS = {name: (name, schema.id_column, schema.id_base) for name, schema in SCHEMAS.items() if name != "branches"}
+# Entities whose IDs are referenced by other entities' batches and therefore kept in memory
+LIVE_ENTITIES = ("customers", "accounts")
+# IDs removed by CDC delete events, one file of int64 IDs per entity
+DELETED_IDS_DIR = os.path.join(DATA_DIR, "_manifests", "cdc")
+
+
+class IdRegistry:
+    """Process-wide ID sequences and live customer/account IDs shared by all automator threads. It is also the
+    index of existing IDs that CDC events pick from: the written ordinals of each entity's sequence, less the
+    deleted IDs."""
+
+    def __init__(self, data_dir=DATA_DIR, deleted_ids_dir=DELETED_IDS_DIR, sequence_dir=SEQUENCE_DIR):
+        self.data_dir = data_dir
+        self.deleted_ids_dir = deleted_ids_dir
+        self.sequence_dir = sequence_dir
+        self._lock = threading.Lock()
+        self._sequences = {}
+        self._deleted = {}
+        self._live_buffers = {entity: np.empty(0, dtype=np.int64) for entity in LIVE_ENTITIES}
+        self._live_counts = {entity: 0 for entity in LIVE_ENTITIES}
+        self._live_loaded = set()
+
+    def seed(self, entities=None):
+        for entity in entities or ENTITY_IDS:
+            with self._lock:
+                self._seed_entity(entity)
+        log.info("ID registry seeded: %s", {entity: int(ids_of(entity, sequence.next))
+                                             for entity, sequence in self._sequences.items()})
+
+    def _seed_entity(self, entity):
+        name, id_column, _ = ENTITY_IDS[entity]
+        path = dataset_path(self.data_dir, name)
+        if entity not in self._sequences:
+            sequence = Sequence(entity, self.sequence_dir)
+            last_id = max_id(path, id_column) if not sequence.exists else None
+            if last_id is not None:
+                # Data from before the sequences: continue after its highest ID, once
+                sequence.advance(ordinal_after(entity, int(last_id)))
+            self._sequences[entity] = sequence
+        deleted_path = os.path.join(self.deleted_ids_dir, entity)
+        if entity not in self._deleted:
+            deleted = np.fromfile(deleted_path, dtype=np.int64) if os.path.exists(deleted_path) else []
+            self._deleted[entity] = set(int(i) for i in deleted)
+        if entity in LIVE_ENTITIES and dataset_exists(path):
+            # Other entities' batches reference these, so the live entities' IDs are still read once
+            ids = read_column(path, id_column).astype(np.int64)
+            if self._deleted[entity]:
+                ids = ids[~np.isin(ids, list(self._deleted[entity]))]
+            self._live_buffers[entity] = ids
+            self._live_counts[entity] = len(ids)
+            self._live_loaded.add(entity)
+
+    def release(self):
+        # Called on a clean stop, once the last batch is written
+        with self._lock:
+            for sequence in self._sequences.values():
+                sequence.release()
+
+    def _sequence(self, entity):
+        if entity not in self._sequences:
+            self._seed_entity(entity)
+        return self._sequences[entity]
+
+    def next_ids(self, entity, count):
+        with self._lock:
+            start = self._sequence(entity).allocate(count)
+        return ids_of(entity, np.arange(start, start + count))
+
+    def live_ids(self, entity):
+        with self._lock:
+            if entity not in self._live_loaded:
+                self._seed_entity(entity)
+            # Slots below the count are never written again, so the view is a stable snapshot.
+            return self._live_buffers[entity][:self._live_counts[entity]]
+
+    def add_live_ids(self, entity, new_ids):
+        new_ids = np.asarray(new_ids, dtype=np.int64)
+        with self._lock:
+            buffer = self._live_buffers[entity]
+            count = self._live_counts[entity]
+            needed = count + len(new_ids)
+            if needed > len(buffer):
+                grown = np.empty(max(needed, 2 * len(buffer)), dtype=np.int64)
+                grown[:count] = buffer[:count]
+                self._live_buffers[entity] = buffer = grown
+            buffer[count:needed] = new_ids
+            self._live_counts[entity] = needed
+            self._live_loaded.add(entity)
+            self._mark_written(entity, new_ids)
+
+    def _mark_written(self, entity, ids):
+        if len(ids):
+            self._sequence(entity).mark_written(int(ordinals_of(entity, ids).max()) + 1)
+
+    def mark_written(self, entity, ids):
+        # Called once a batch is in its dataset; from then on CDC events may pick its IDs.
+        with self._lock:
+            self._mark_written(entity, ids)
+
+    def existing_ids(self, entity, count, rng):
+        # Up to `count` distinct IDs that are written and not deleted, without reading the dataset.
+        with self._lock:
+            ids = ids_of(entity, self._sequence(entity).existing(count, rng))
+            deleted = self._deleted[entity]
+            if deleted:
+                ids = ids[np.fromiter((int(i) not in deleted for i in ids), dtype=bool, count=len(ids))]
+        return rng.permutation(ids)[:count]
+
+    def delete_ids(self, entity, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            self._deleted[entity].update(int(i) for i in ids)
+            os.makedirs(self.deleted_ids_dir, exist_ok=True)
+            with open(os.path.join(self.deleted_ids_dir, entity), "ab") as f:
+                f.write(ids.tobytes())
+            if entity in self._live_loaded:
+                # A new buffer rather than an in-place removal, so views handed out by live_ids stay valid
+                live = self._live_buffers[entity][:self._live_counts[entity]]
+                self._live_buffers[entity] = live[~np.isin(live, ids)]
+                self._live_counts[entity] = len(self._live_buffers[entity])
+
+    def customer_ids(self):
+        return self.live_ids("customers")
+
+    def add_customers(self, new_ids):
+        self.add_live_ids("customers", new_ids)
+
+    def account_ids(self):
+        return self.live_ids("accounts")
+
+    def add_accounts(self, new_ids):
+        self.add_live_ids("accounts", new_ids)
+
+
+registry = IdRegistry()
@@ -1,44 +1,58 @@
+import argparse
 import os
-import threading
 import time
+from functools import partial
 
 from logger import log
 
-from src.data_automator.data_generator.accounts_generator import run_accounts_generator
-from src.data_automator.data_generator.aml_generator import run_aml_generator
-from src.data_automator.data_generator.customers_generator import run_customers_generator
-from src.data_automator.data_generator.depots_generator import run_depots_generator
-from src.data_automator.data_generator.digital_generator import run_digital_generator
-from src.data_automator.data_generator.loans_generator import run_loans_generator
-from src.data_automator.data_generator.marketing_generator import run_marketing_generator
-from src.data_automator.data_generator.risk_alerts_generator import run_risk_alerts_generator
-from src.data_automator.data_generator.shares_generator import run_shares_generator
-
-
-def start_generator(generator_func, name):
-    thread = threading.Thread(target=generator_func, name=name, daemon=True)
-    thread.start()
-    log.info("Started thread for %s", name)
-    return thread
-
-def main():
-    threads = []
-    threads.append(start_generator(run_customers_generator, "CustomersGenerator"))
-    threads.append(start_generator(run_accounts_generator, "AccountsGenerator"))
-    threads.append(start_generator(run_loans_generator, "LoansGenerator"))
-    threads.append(start_generator(run_marketing_generator, "MarketingGenerator"))
-    threads.append(start_generator(run_digital_generator, "DigitalGenerator"))
-    threads.append(start_generator(run_risk_alerts_generator, "RiskAlertsGenerator"))
-    threads.append(start_generator(run_shares_generator, "SharesGenerator"))
-    threads.append(start_generator(run_depots_generator, "DepotsGenerator"))
-    threads.append(start_generator(run_aml_generator, "AMLGenerator"))
-
-    # Keep the main thread alive indefinitely.
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        log.info("Main generator interrupted by user. Exiting...")
+from src.common import metrics
+from src.config.config import vfake
+from src.data_automator.data_generator.batch_generator import BATCH_SETTINGS, generate_batch
+from src.data_automator import cdc, compaction, schema_evolution
+from src.data_automator.id_registry import registry
+from src.data_automator.scheduler import AUTOMATOR_MODE, Job, RateJob, Scheduler
+
+
+def build_jobs(mode=AUTOMATOR_MODE, entities=None):
+    # entities: only these entities' batch and CDC jobs, e.g. to run one generator on its own
+    jobs = []
+    for name, settings in BATCH_SETTINGS.items():
+        if entities and name not in entities:
+            continue
+        batch_func = partial(generate_batch, name)
+        rate = settings["rate"]
+        if mode == "firehose" and rate > 0:
+            jobs.append(RateJob(name, batch_func, rate))
+            log.info("%s: firehose at %.0f rows/s in batches of %d rows", name, rate, jobs[-1].max_batch)
+        else:
+            jobs.append(Job(name, batch_func, settings["min_sleep"], settings["max_sleep"], settings["max_batch"]))
+        cdc_rate = settings["cdc_rate"]
+        if cdc_rate > 0:
+            # Update/delete events for existing rows, paced like a firehose job in either mode
+            jobs.append(RateJob(name + "_cdc", partial(cdc.generate_cdc_batch, name), cdc_rate))
+            log.info("%s: CDC events at %.0f events/s", name, cdc_rate)
+    if entities:
+        return jobs
+    evolution = schema_evolution.EvolutionJob()
+    if evolution.change_file or evolution.random_changes:
+        jobs.append(evolution)
+    if compaction.COMPACTION_INTERVAL_SECONDS > 0:
+        jobs.append(compaction.CompactionJob())
+    return jobs
+
+
+def main(entities=None):
+    metrics.start_server()
+    # Continue with the schema versions an earlier run evolved the entities to
+    schema_evolution.load()
+    # Scan every dataset once up front; from here on the batch jobs share IDs and customers in memory.
+    registry.seed()
+    # Sample the Faker vocabularies now rather than inside the first batch of each job.
+    vfake.warm_up()
+    scheduler = Scheduler(build_jobs(entities=entities))
+    scheduler.install_signal_handlers()
+    scheduler.run()
+    log.info("Automator stopped.")
 
 
 def wait_for_initial_data(data_dir, marker_file, poll_interval=5):
@@ -50,9 +64,21 @@ def wait_for_initial_data(data_dir, marker_file, poll_interval=5):
     log.info("Initial data detected. Proceeding with continuous data automator.")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Continuously append batches to the generated datasets.")
+    parser.add_argument("--entities", type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+                        help="comma separated entities to generate, e.g. transactions; default all")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.entities or [] if name not in BATCH_SETTINGS]
+    if unknown:
+        parser.error(f"unknown entities {unknown}, expected some of {list(BATCH_SETTINGS)}")
+    return args
+
+
 if __name__ == "__main__":
+    args = parse_args()
     DATA_DIR = os.getenv("DATA_DIR", "/app/data")
     wait_for_initial_data(DATA_DIR, "initial_complete.flag")
     # Start the automator. Using os.execv or os.system is acceptable.
     log.info("Starting main automator...")
-    main()
\ No newline at end of file
+    main(args.entities)
\ No newline at end of file
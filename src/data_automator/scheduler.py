@@ -0,0 +1,259 @@
+import heapq
+import itertools
+import os
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+from logger import log
+
+from src.common import metrics
+from src.data_automator.id_registry import registry
+
+load_dotenv()
+
+# Batch jobs run on a bounded pool; the scheduler itself only sleeps until the next fire time.
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", 4))
+# Entities that start paused, e.g. "loans,depots"
+PAUSED_ENTITIES = [name.strip() for name in os.getenv("PAUSED_ENTITIES", "").split(",") if name.strip()]
+# Optional file listing paused entities, one per line; re-read every CONTROL_POLL_SECONDS.
+PAUSE_FILE = os.getenv("PAUSE_FILE", "")
+CONTROL_POLL_SECONDS = float(os.getenv("CONTROL_POLL_SECONDS", 5))
+# interval: random sleeps and batch sizes per entity. firehose: entities with a RATE_<ENTITY> (rows/sec) are
+# paced by a token bucket and emit one batch per FIREHOSE_BATCH_SECONDS worth of rows.
+AUTOMATOR_MODE = os.getenv("AUTOMATOR_MODE", "interval").lower()
+FIREHOSE_BATCH_SECONDS = float(os.getenv("FIREHOSE_BATCH_SECONDS", 1))
+FIREHOSE_REPORT_SECONDS = float(os.getenv("FIREHOSE_REPORT_SECONDS", 10))
+
+
+class Job:
+    """One entity's batch function and the sleep/batch-size ranges it is fired with."""
+
+    def __init__(self, name, batch_func, min_sleep, max_sleep, max_batch):
+        self.name = name
+        self.batch_func = batch_func
+        self.min_sleep = min_sleep
+        self.max_sleep = max_sleep
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+
+    def next_delay(self):
+        return random.randint(self.min_sleep, self.max_sleep)
+
+    def run_batch(self, batch_size):
+        with metrics.profiled(self.name), metrics.timer("datagen_batch_seconds", entity=self.name):
+            rows = self.batch_func(batch_size) or 0
+        metrics.inc("datagen_batches_total", entity=self.name)
+        return rows
+
+    def run_once(self):
+        batch_size = random.randint(1, self.max_batch)
+        rows = self.run_batch(batch_size)
+        self.batches += 1
+        self.rows += rows
+        if rows:
+            log.info("Added %d new %s rows.", rows, self.name)
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second and holds at most `capacity` of them."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, count):
+        self._refill()
+        return max(0.0, (count - self.tokens) / self.rate)
+
+    def take(self, count):
+        self._refill()
+        taken = min(count, int(self.tokens))
+        self.tokens -= taken
+        return taken
+
+
+class RateJob(Job):
+    """Firehose job: emits batches as fast as its token bucket allows. Falling behind is not caught up
+    later, since the bucket never holds more than one batch; the shortfall shows up as achieved < target."""
+
+    def __init__(self, name, batch_func, rate, batch_seconds=FIREHOSE_BATCH_SECONDS):
+        batch_size = max(1, int(rate * batch_seconds))
+        super().__init__(name, batch_func, 0, 0, batch_size)
+        self.rate = rate
+        self.bucket = TokenBucket(rate, batch_size)
+        self.started = None
+        self._window_start = None
+        self._window_rows = 0
+
+    def next_delay(self):
+        return self.bucket.wait_time(self.max_batch)
+
+    def run_once(self):
+        if self.started is None:
+            self.started = self._window_start = time.monotonic()
+        batch_size = self.bucket.take(self.max_batch)
+        if batch_size == 0:
+            return
+        rows = self.run_batch(batch_size)
+        self.batches += 1
+        self.rows += rows
+        self._window_rows += rows
+        log.debug("Added %d new %s rows.", rows, self.name)
+
+    def report(self, final=False):
+        if self.started is None:
+            return
+        now = time.monotonic()
+        since = self.started if final else self._window_start
+        rows = self.rows if final else self._window_rows
+        achieved = rows / max(now - since, 1e-9)
+        log.info("%s%s: %.0f rows/s achieved, target %.0f rows/s (%.0f%%)", self.name, " overall" if final else "",
+                 achieved, self.rate, 100 * achieved / self.rate)
+        self._window_start = now
+        self._window_rows = 0
+
+
+class Scheduler:
+    """Fires jobs from a heap of next-fire times. A job is rescheduled only once its batch has finished,
+    so batches of the same entity never overlap."""
+
+    def __init__(self, jobs, max_workers=SCHEDULER_WORKERS, paused=PAUSED_ENTITIES, pause_file=PAUSE_FILE,
+                 report_interval=FIREHOSE_REPORT_SECONDS):
+        self.jobs = {job.name: job for job in jobs}
+        self.pause_file = pause_file
+        self.max_workers = max_workers
+        self.rate_jobs = [job for job in jobs if isinstance(job, RateJob)]
+        self.report_interval = report_interval if self.rate_jobs else 0
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="BatchWorker")
+        self._paused = set(paused)
+        self._parked = set()
+        self._stopping = False
+        self._pause_file_checked = 0.0
+        self._reported = time.monotonic()
+
+    def _push(self, name, fire_time):
+        heapq.heappush(self._heap, (fire_time, next(self._sequence), name))
+
+    def pause(self, name):
+        with self._condition:
+            if name not in self._paused:
+                self._paused.add(name)
+                log.info("Paused %s", name)
+
+    def resume(self, name):
+        with self._condition:
+            if name in self._paused:
+                self._paused.discard(name)
+                log.info("Resumed %s", name)
+            if name in self._parked:
+                self._parked.discard(name)
+                self._push(name, time.monotonic())
+                self._condition.notify()
+
+    def stop(self, *_):
+        with self._condition:
+            if not self._stopping:
+                log.info("Stopping scheduler; waiting for running batches to finish.")
+            self._stopping = True
+            self._condition.notify()
+
+    def install_signal_handlers(self):
+        # Docker sends SIGTERM on `docker stop`; Ctrl+C sends SIGINT. Both stop the scheduler gracefully.
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def _apply_pause_file(self):
+        now = time.monotonic()
+        if not self.pause_file or now - self._pause_file_checked < CONTROL_POLL_SECONDS:
+            return
+        self._pause_file_checked = now
+        try:
+            with open(self.pause_file) as f:
+                wanted = {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            wanted = set()
+        for name in self.jobs:
+            if name in wanted:
+                self.pause(name)
+            elif name in self._paused:
+                self.resume(name)
+
+    def _report_rates(self):
+        now = time.monotonic()
+        if not self.report_interval or now - self._reported < self.report_interval:
+            return
+        self._reported = now
+        for job in self.rate_jobs:
+            job.report()
+
+    def _wait(self, timeout):
+        # Wake up for the pause file and the rate report even when no job is due.
+        intervals = [interval for interval in (CONTROL_POLL_SECONDS if self.pause_file else 0, self.report_interval)
+                     if interval]
+        if intervals:
+            timeout = min(intervals) if timeout is None else min(timeout, *intervals)
+        self._condition.wait(timeout)
+
+    def _run_job(self, job, fire_time):
+        # Queue lag: how late the batch starts, be it from a saturated worker pool or a slow scheduler loop.
+        metrics.observe("datagen_queue_lag_seconds", max(0.0, time.monotonic() - fire_time), entity=job.name)
+        try:
+            job.run_once()
+        except Exception as e:
+            metrics.inc("datagen_batch_errors_total", entity=job.name)
+            log.error("Batch for %s failed: %s", job.name, e)
+        finally:
+            with self._condition:
+                if not self._stopping:
+                    self._push(job.name, time.monotonic() + job.next_delay())
+                    self._condition.notify()
+
+    def run(self):
+        # Every job fires once right away, then after each of its sleeps, like the former per-entity threads.
+        with self._condition:
+            for name in self.jobs:
+                self._push(name, time.monotonic())
+        log.info("Scheduler started with %d jobs on %d workers.", len(self.jobs), self.max_workers)
+        try:
+            with self._condition:
+                while not self._stopping:
+                    self._apply_pause_file()
+                    self._report_rates()
+                    if not self._heap:
+                        self._wait(None)
+                        continue
+                    fire_time, _, name = self._heap[0]
+                    delay = fire_time - time.monotonic()
+                    if delay > 0:
+                        self._wait(delay)
+                        continue
+                    heapq.heappop(self._heap)
+                    if name in self._paused:
+                        # Parked until resume() puts it back on the heap.
+                        self._parked.add(name)
+                        continue
+                    self._executor.submit(self._run_job, self.jobs[name], fire_time)
+        finally:
+            # Let in-flight batches finish their writes before the process exits.
+            self._executor.shutdown(wait=True)
+            # Nothing allocates IDs any more; the reserved but unused ones are not lost
+            registry.release()
+            for job in self.jobs.values():
+                log.info("%s: %d batches, %d rows", job.name, job.batches, job.rows)
+            for job in self.rate_jobs:
+                job.report(final=True)
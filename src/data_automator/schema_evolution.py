@@ -0,0 +1,195 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from dotenv import load_dotenv
+from logger import log
+
+from src.common.schema import CONVERSIONS, TYPES
+from src.common.schemas import SCHEMAS, set_schema
+from src.common.sink import dataset_path, versioned_path
+from src.data_automator.id_registry import ENTITY_IDS
+from src.data_automator.scheduler import CONTROL_POLL_SECONDS, Job
+
+load_dotenv()
+
+# Live schema evolution: a change (add, drop, rename or retype a column) makes the next version of an entity's
+# schema. New batches go to that version's own file or directory (see sink.versioned_path), which comes with a
+# schema manifest, so no existing row is ever rewritten and a change costs nothing but the rows written after it.
+
+DATA_DIR = os.getenv("DATA_DIR", "../../../data")
+SCHEMA_MANIFEST_DIR = os.path.join(DATA_DIR, "_manifests", "schemas")
+# Every applied change as one JSON line
+SCHEMA_EVENT_LOG = os.getenv("SCHEMA_EVENT_LOG", os.path.join(DATA_DIR, "_manifests", "schema_events.jsonl"))
+# Random changes every MIN..MAX seconds; 0 disables them
+MIN_SLEEP_TIME_SCHEMA_EVOLUTION = int(os.getenv("MIN_SLEEP_TIME_SCHEMA_EVOLUTION", 0))
+MAX_SLEEP_TIME_SCHEMA_EVOLUTION = int(os.getenv("MAX_SLEEP_TIME_SCHEMA_EVOLUTION", 0))
+# Entities and kinds of change the random changes pick from; default all
+SCHEMA_EVOLUTION_ENTITIES = [name.strip() for name in os.getenv("SCHEMA_EVOLUTION_ENTITIES", "").split(",")
+                             if name.strip()] or list(ENTITY_IDS)
+CHANGE_KINDS = ("add_column", "drop_column", "rename_column", "retype_column")
+SCHEMA_EVOLUTION_CHANGES = [kind.strip() for kind in os.getenv("SCHEMA_EVOLUTION_CHANGES", "").split(",")
+                            if kind.strip()] or list(CHANGE_KINDS)
+# Optional file of requested changes, one JSON object per line, e.g.
+# {"entity": "accounts", "change": "rename_column", "column": "Balance", "new_column": "CurrentBalance"}
+# It is applied and removed every CONTROL_POLL_SECONDS.
+SCHEMA_CHANGE_FILE = os.getenv("SCHEMA_CHANGE_FILE", "")
+
+_lock = threading.Lock()
+# Entity -> the changes that lead from the declared schema to the current one
+_changes = {}
+
+
+def _manifest_path(entity, version):
+    return os.path.join(SCHEMA_MANIFEST_DIR, f"{entity}.v{version}.json")
+
+
+def write_schema_manifest(schema, changes):
+    os.makedirs(SCHEMA_MANIFEST_DIR, exist_ok=True)
+    manifest = {"entity": schema.name, "version": schema.version,
+                "dataset": os.path.basename(versioned_path(dataset_path(DATA_DIR, schema.name), schema.version)),
+                "id_column": schema.id_column,
+                "columns": [{"name": column.label, "type": column.dtype} for column in schema.columns
+                            if not column.hidden],
+                "changes": changes, "created": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    path = _manifest_path(schema.name, schema.version)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def read_schema_manifest(entity, version):
+    with open(_manifest_path(entity, version)) as f:
+        return json.load(f)
+
+
+def _latest_version(entity):
+    pattern = re.compile(re.escape(entity) + r"\.v(\d+)\.json")
+    if not os.path.isdir(SCHEMA_MANIFEST_DIR):
+        return 1
+    versions = [int(match.group(1)) for match in map(pattern.fullmatch, os.listdir(SCHEMA_MANIFEST_DIR)) if match]
+    return max(versions, default=1)
+
+
+def load():
+    # Replays the changes recorded in each entity's latest manifest, so a restarted automator continues
+    # writing the schema version it stopped at.
+    for entity in ENTITY_IDS:
+        version = _latest_version(entity)
+        if version == 1:
+            continue
+        changes = read_schema_manifest(entity, version)["changes"]
+        schema = SCHEMAS[entity]
+        for change in changes:
+            schema = schema.evolve(change)
+            set_schema(schema)
+        _changes[entity] = changes
+        log.info("%s: schema version %d (%d changes)", entity, schema.version, len(changes))
+
+
+def _log_event(event):
+    os.makedirs(os.path.dirname(SCHEMA_EVENT_LOG) or ".", exist_ok=True)
+    with open(SCHEMA_EVENT_LOG, "a") as f:
+        f.write(json.dumps(event) + "\n")
+
+
+def apply_change(entity, change, trigger="request"):
+    with _lock:
+        schema = SCHEMAS[entity]
+        evolved = schema.evolve(change)
+        changes = _changes.get(entity, []) + [change]
+        if schema.version == 1 and not os.path.exists(_manifest_path(entity, 1)):
+            write_schema_manifest(schema, [])
+        # The manifest is in place before the first batch of the new version is written
+        write_schema_manifest(evolved, changes)
+        set_schema(evolved)
+        _changes[entity] = changes
+    event = dict(change, entity=entity, from_version=schema.version, version=evolved.version, trigger=trigger,
+                 dataset=os.path.basename(versioned_path(dataset_path(DATA_DIR, entity), evolved.version)),
+                 time=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    if change["change"] == "retype_column":
+        event["previous_type"] = schema.output_column(change["column"]).dtype
+    _log_event(event)
+    log.info("%s: schema version %d: %s", entity, evolved.version,
+             ", ".join(f"{key}={value}" for key, value in change.items()))
+    return evolved
+
+
+def random_change(schema, kinds=SCHEMA_EVOLUTION_CHANGES, rng=random):
+    columns = [column for column in schema.columns if not column.hidden and column.name != schema.id_column]
+    retypable = [column for column in columns if any(source == column.dtype for source, _ in CONVERSIONS)]
+    kind = rng.choice(kinds)
+    version = schema.version + 1
+    if kind == "drop_column" and len(columns) > 1:
+        return {"change": kind, "column": rng.choice(columns).label}
+    if kind == "rename_column" and columns:
+        label = rng.choice(columns).label
+        return {"change": kind, "column": label, "new_column": f"{re.sub(r'_v[0-9]+$', '', label)}_v{version}"}
+    if kind == "retype_column" and retypable:
+        column = rng.choice(retypable)
+        return {"change": kind, "column": column.label,
+                "type": rng.choice([target for source, target in CONVERSIONS if source == column.dtype])}
+    return {"change": "add_column", "column": f"Attribute_v{version}", "type": rng.choice(TYPES)}
+
+
+def read_change_file(path=SCHEMA_CHANGE_FILE):
+    # The file is claimed by renaming it first, so lines appended meanwhile land in a new file.
+    claimed = path + ".applying"
+    try:
+        os.replace(path, claimed)
+    except FileNotFoundError:
+        return []
+    requests = []
+    with open(claimed) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                requests.append(json.loads(line))
+            except ValueError:
+                log.error("Ignoring malformed schema change in %s: %s", path, line.strip())
+    os.remove(claimed)
+    return requests
+
+
+class EvolutionJob(Job):
+    """Applies the changes requested in SCHEMA_CHANGE_FILE and, if enabled, a random change every
+    MIN_SLEEP_TIME_SCHEMA_EVOLUTION..MAX_SLEEP_TIME_SCHEMA_EVOLUTION seconds."""
+
+    def __init__(self, change_file=SCHEMA_CHANGE_FILE, min_sleep=MIN_SLEEP_TIME_SCHEMA_EVOLUTION,
+                 max_sleep=MAX_SLEEP_TIME_SCHEMA_EVOLUTION, entities=SCHEMA_EVOLUTION_ENTITIES):
+        super().__init__("schema_evolution", None, min_sleep, max(min_sleep, max_sleep), 1)
+        self.change_file = change_file
+        self.entities = [entity for entity in entities if entity in ENTITY_IDS]
+        self.random_changes = max_sleep > 0 and bool(self.entities)
+        self._next_random = time.monotonic() + random.randint(self.min_sleep, self.max_sleep)
+
+    def next_delay(self):
+        delays = [max(0.0, self._next_random - time.monotonic())] if self.random_changes else []
+        if self.change_file:
+            delays.append(CONTROL_POLL_SECONDS)
+        return min(delays, default=CONTROL_POLL_SECONDS)
+
+    def _apply(self, entity, change, trigger):
+        try:
+            apply_change(entity, change, trigger)
+        except (KeyError, ValueError) as e:
+            log.error("Schema change %s for %s rejected: %s", change, entity, e)
+            return
+        self.batches += 1
+
+    def run_once(self):
+        if self.change_file:
+            for request in read_change_file(self.change_file):
+                entity = request.pop("entity", None)
+                if entity not in ENTITY_IDS:
+                    log.error("Schema change %s names no automator entity", request)
+                    continue
+                self._apply(entity, request, "request")
+        if self.random_changes and time.monotonic() >= self._next_random:
+            entity = random.choice(self.entities)
+            self._apply(entity, random_change(SCHEMAS[entity]), "schedule")
+            self._next_random = time.monotonic() + random.randint(self.min_sleep, self.max_sleep)
@@ -0,0 +1,36 @@
+import time
+
+from logger import log
+
+from src.common.schemas import build_batch
+from src.common.seeding import chunk_rng
+from src.common.sequence import entity_ids
+from src.initial_data_generation.utils import write_chunks, CHUNK_SIZE
+
+# The initial datasets come from their entity schemas (see src.common.schemas): one generator for all of them.
+
+
+def generate_chunk(entity, start_index, num_rows, references):
+    rng = chunk_rng(entity, start_index // CHUNK_SIZE)
+    ids = entity_ids(entity, start_index, num_rows)
+    return build_batch(entity, ids, references, rng)
+
+
+def iter_chunks(entity, num_rows, references, start_index=0, chunk_size=CHUNK_SIZE):
+    for offset in range(0, num_rows, chunk_size):
+        yield generate_chunk(entity, start_index + offset, min(chunk_size, num_rows - offset), references)
+
+
+def generate_dataset(entity, num_rows, references, start_index=0):
+    # Rows start_index .. start_index + num_rows - 1 of the entity, written as parts; references maps each
+    # entity the schema references to the IDs to draw from, e.g. {"customers": customer_ids}.
+    log.info("Start generating %s", entity)
+    start_time = time.time()
+    try:
+        chunks = iter_chunks(entity, num_rows, references, start_index)
+        rows = write_chunks(chunks, entity, part=start_index // CHUNK_SIZE + 1)
+        log.debug("%s rows written: %d", entity, rows)
+        log.info("%s dataset generated in %.2f seconds.", entity, time.time() - start_time)
+    except Exception as e:
+        log.error("Error generating %s: %s", entity, e)
+        raise
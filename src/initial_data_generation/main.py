@@ -1,24 +1,21 @@
+import argparse
 import os
 import shutil
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
-import numpy as np
-import pandas as pd
 from logger import log
 
-from generators.accounts_generator import generate_accounts
-from generators.aml_compliance_generator import generate_aml_compliance
-from generators.branches_generator import generate_branches
-from generators.customer_generator import generate_customers
-from generators.depots_generator import generate_depots
-from generators.digital_interaction_generator import generate_digital_interactions
-from generators.loans_generator import generate_loans
-from generators.marketing_generator import generate_marketing
-from generators.risk_alert_generator import generate_risk_alerts
-from generators.shares_generator import generate_shares
-from src.config.config import DATA_DIR, SCALE_FACTOR, NUM_CUSTOMER, TEMP_DATA_DIR
-from utils import combine_chunks
+from generators.dataset_generator import generate_dataset
+from src.common import metrics, sql_sink
+from src.common.schemas import SCHEMAS
+from src.common.sequence import advance_sequences, entity_ids, ordinal_after
+from src.common.sink import count_rows, dataset_path, has_rows, max_id, read_column
+from src.config.config import DATA_DIR, SCALE_FACTOR, NUM_CUSTOMER, TEMP_DATA_DIR, CHUNK_SIZE, vfake
+from utils import (MERGE_LOCK, VERIFY_CHECKSUMS, acquire_merge_lock, combine_chunks, dataset_checksum, part_files,
+                   read_manifest, read_shard_manifests, release_merge_lock, remove_parts, remove_shard_manifests,
+                   write_shard_manifest)
 
 # Derived parameters
 num_customers_large = SCALE_FACTOR * NUM_CUSTOMER
@@ -33,54 +30,219 @@ num_shares = num_customers_large * 3
 num_depots = int(num_customers_large * 0.5)
 num_aml = num_customers_large // 20
 
-# List of required datasets and corresponding generator functions with arguments.
-# Note: For datasets that require customer IDs, we assume that after customers are generated,
-# customer_ids is defined as below.
+# Worker processes used for generation, and the smallest row range worth shipping to a worker.
+NUM_WORKERS = int(os.getenv("NUM_WORKERS", os.cpu_count() or 1))
+MIN_ROWS_PER_TASK = int(os.getenv("MIN_ROWS_PER_TASK", 10000))
+
+# Required datasets and their row counts; each is generated from its entity schema by generate_dataset.
 REQUIRED_DATASETS = [
-    ("customers", generate_customers, (num_customers_large,)),
-    # The rest require customer_ids, which we'll compute after ensuring customers exist.
-    ("accounts", generate_accounts, (num_accounts_large,)),
-    ("loans", generate_loans, (num_loans_large,)),
-    ("branches", generate_branches, (num_branches,)),
-    ("marketing", generate_marketing, (num_marketing,)),
-    ("digital_interactions", generate_digital_interactions, (num_digital_sessions,)),
-    ("risk_alerts", generate_risk_alerts, (num_risk_alerts,)),
-    ("shares", generate_shares, (num_shares,)),
-    ("depots", generate_depots, (num_depots,)),
-    ("aml_compliance", generate_aml_compliance, (num_aml,))
+    ("customers", num_customers_large),
+    ("accounts", num_accounts_large),
+    ("loans", num_loans_large),
+    ("branches", num_branches),
+    ("marketing", num_marketing),
+    ("digital_interactions", num_digital_sessions),
+    ("risk_alerts", num_risk_alerts),
+    ("shares", num_shares),
+    ("depots", num_depots),
+    ("aml_compliance", num_aml),
+    ("transactions", num_transactions_large),
 ]
+# Datasets that do not take customer_ids; they are generated in the first phase.
+INDEPENDENT_DATASETS = ("customers", "branches")
+# Datasets that take the account IDs of the finished accounts dataset; they are generated last.
+ACCOUNT_DATASETS = ("transactions",)
 
 
-def file_exists_and_has_data(filename):
-    file_path = os.path.join(DATA_DIR, filename)
-    if not os.path.exists(file_path):
-        return False
+def file_exists_and_has_data(dataset_name):
+    # Only stat and the first data row (or Parquet footers) are read; a full parse of every dataset made
+    # restarts on a populated volume take minutes.
+    path = dataset_path(DATA_DIR, dataset_name)
     try:
-        df = pd.read_csv(file_path)
-        # We assume the file has a header; at least one data row means shape[0] >= 1.
-        return df.shape[0] >= 1
+        if sql_sink.enabled():
+            return has_rows(path)
+        if not os.path.exists(path) or os.path.isfile(path) and os.path.getsize(path) == 0:
+            return False
+        manifest = read_manifest(dataset_name)
+        if manifest is not None:
+            checksum = manifest.get("sha256")
+            if VERIFY_CHECKSUMS and checksum and dataset_checksum(path) != checksum:
+                log.error("Checksum mismatch for %s", manifest["file"])
+                return False
+            return manifest["rows"] >= 1
+        return has_rows(path)
     except Exception as e:
-        log.error("Error reading %s: %s", filename, e)
+        log.error("Error reading %s: %s", path, e)
         return False
 
 
-def generate_missing_data(customer_ids):
-    # For each dataset, if the file is missing or empty, call its generator once.
-    for dataset_name, generator_func, args in REQUIRED_DATASETS:
+def initial_sequence_ends():
+    # Entity -> first ordinal above the highest ID in its dataset
+    ends = {}
+    for name, _ in REQUIRED_DATASETS:
+        if name != "branches":
+            last_id = max_id(dataset_path(DATA_DIR, name), SCHEMAS[name].id_column)
+            ends[name] = ordinal_after(name, int(last_id)) if last_id is not None else 0
+    return ends
+
+
+def shard_row_range(num_rows, shard_index=0, shard_count=1):
+    # Each shard owns a contiguous run of whole chunks: IDs and part numbers of different shards never overlap,
+    # and every chunk keeps the random stream it gets in a single-node run.
+    num_chunks = -(-num_rows // CHUNK_SIZE)
+    first_row = num_chunks * shard_index // shard_count * CHUNK_SIZE
+    last_row = min(num_chunks * (shard_index + 1) // shard_count * CHUNK_SIZE, num_rows)
+    return first_row, max(first_row, last_row)
+
+
+def plan_row_ranges(first_row, last_row):
+    # Split a row range into tasks aligned to CHUNK_SIZE so that part numbers never overlap.
+    rows_per_task = max(MIN_ROWS_PER_TASK, -(-(last_row - first_row) // NUM_WORKERS))
+    rows_per_task = -(-rows_per_task // CHUNK_SIZE) * CHUNK_SIZE
+    return [(start, min(rows_per_task, last_row - start)) for start in range(first_row, last_row, rows_per_task)]
+
+
+def run_generation_task(dataset_name, num_rows, references, start_index):
+    # Each chunk seeds its own random stream from (dataset, chunk index), so the output does not depend on
+    # how the row ranges are spread over workers.
+    with metrics.profiled("generate_" + dataset_name):
+        generate_dataset(dataset_name, num_rows, references, start_index=start_index)
+    metrics.dump_profiles()
+    # Worker metrics travel back with the result and are merged into the parent's /metrics.
+    return metrics.drain()
+
+
+def combine_task(dataset_name):
+    combine_chunks(dataset_name)
+    return metrics.drain()
+
+
+def dataset_references(dataset_name, customer_ids, sharded=False):
+    # The IDs of the entities the dataset's schema references
+    references = {}
+    for entity in SCHEMAS[dataset_name].references:
+        if entity == "customers":
+            references[entity] = customer_ids
+        elif sharded and not file_exists_and_has_data(entity):
+            # The other shards' rows are not merged yet; a complete dataset has exactly these IDs.
+            references[entity] = entity_ids(entity, 0, dict(REQUIRED_DATASETS)[entity])
+        else:
+            # The IDs actually present, which also covers a dataset kept from an earlier run.
+            references[entity] = read_column(dataset_path(DATA_DIR, entity), SCHEMAS[entity].id_column)
+    return references
+
+
+def generate_missing_data(customer_ids, shard_index=0, shard_count=1):
+    # For each dataset, if the file is missing or empty, generate it (or this shard's rows of it) across the
+    # worker pool. Sharded runs leave the parts in TEMP_DATA_DIR for merge_shards.
+    sharded = shard_count > 1
+    generated = {}
+    missing = []
+    for dataset_name, num_rows in REQUIRED_DATASETS:
         log.debug(f"Dataset name: {dataset_name}")
-        filename = dataset_name + ".csv"
-        if not file_exists_and_has_data(filename):
+        filename = os.path.basename(dataset_path(DATA_DIR, dataset_name))
+        if not file_exists_and_has_data(dataset_name):
             log.info("File %s is missing or empty. Generating initial data...", filename)
-            # For generators that require customer_ids, append customer_ids to the args.
-            if dataset_name == "customers" or dataset_name == "branches":
-                generator_func(*args)
-                # generator_func(*(args + (customer_ids,)))
-            else:
-                generator_func(*(args + (customer_ids,)))
-                # generator_func(*args)
-            combine_chunks(dataset_name)
+            missing.append((dataset_name, num_rows))
         else:
             log.info("File %s exists and has data.", filename)
+    if not missing:
+        return generated
+
+    # Build the Faker vocabularies once so that forked workers share them instead of each sampling its own.
+    vfake.warm_up()
+    dependent = INDEPENDENT_DATASETS + ACCOUNT_DATASETS
+    phases = [[task for task in missing if task[0] in INDEPENDENT_DATASETS],
+              [task for task in missing if task[0] not in dependent],
+              [task for task in missing if task[0] in ACCOUNT_DATASETS]]
+    log.info("Generating %d datasets with %d worker processes.", len(missing), NUM_WORKERS)
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
+        for phase in phases:
+            futures = []
+            for dataset_name, dataset_rows in phase:
+                references = dataset_references(dataset_name, customer_ids, sharded)
+                first_row, last_row = shard_row_range(dataset_rows, shard_index, shard_count)
+                generated[dataset_name] = (first_row, last_row)
+                remove_parts(dataset_name, first_row // CHUNK_SIZE + 1, -(-last_row // CHUNK_SIZE))
+                row_ranges = plan_row_ranges(first_row, last_row)
+                log.debug("Dataset %s split into %d row ranges", dataset_name, len(row_ranges))
+                for start_index, num_rows in row_ranges:
+                    futures.append(executor.submit(run_generation_task, dataset_name, num_rows, references,
+                                                   start_index))
+            for future in futures:
+                metrics.merge(future.result())
+            if sharded:
+                continue
+            if sql_sink.enabled():
+                # One process loads the database (DuckDB files take a single writing process)
+                for dataset_name, _ in phase:
+                    combine_chunks(dataset_name)
+                continue
+            combines = [executor.submit(combine_task, dataset_name) for dataset_name, _ in phase]
+            for future in combines:
+                metrics.merge(future.result())
+    return generated
+
+
+def run_settings():
+    # Shards of one run must agree on these, or their parts do not fit together.
+    return {"scale_factor": SCALE_FACTOR, "num_customer": NUM_CUSTOMER, "chunk_size": CHUNK_SIZE}
+
+
+def run_shard(customer_ids, shard_index, shard_count):
+    if shard_index in read_shard_manifests(shard_count):
+        log.info("Shard %d/%d is already complete.", shard_index, shard_count)
+        return
+    generated = generate_missing_data(customer_ids, shard_index, shard_count)
+    datasets = {}
+    for dataset_name, (first_row, last_row) in generated.items():
+        parts = part_files(dataset_name, first_row // CHUNK_SIZE + 1, -(-last_row // CHUNK_SIZE))
+        datasets[dataset_name] = {"first_row": first_row, "last_row": last_row,
+                                  "rows": sum(count_rows(part) for part in parts),
+                                  "parts": [os.path.basename(part) for part in parts]}
+    write_shard_manifest(shard_index, shard_count, datasets, run_settings())
+    log.info("Shard %d/%d finished %d datasets.", shard_index, shard_count, len(datasets))
+
+
+def merge_shards(shard_count):
+    # Assemble the shards' parts into the final datasets once every shard has recorded its manifest. Returns
+    # False while shards are outstanding or another shard is already merging.
+    manifests = read_shard_manifests(shard_count)
+    waiting = [shard_index for shard_index in range(shard_count) if shard_index not in manifests]
+    if waiting:
+        log.info("Waiting for shards %s of %d; the last shard to finish merges.", waiting, shard_count)
+        return False
+    mismatched = [shard_index for shard_index, manifest in manifests.items()
+                  if any(manifest.get(key) != value for key, value in run_settings().items())]
+    if mismatched:
+        log.critical("Shards %s were generated with different settings than %s.", mismatched, run_settings())
+        sys.exit(1)
+    if not acquire_merge_lock():
+        log.info("Another shard is merging (remove %s if that process is gone).", MERGE_LOCK)
+        return False
+    try:
+        to_merge = []
+        for dataset_name, dataset_rows in REQUIRED_DATASETS:
+            if file_exists_and_has_data(dataset_name):
+                continue
+            rows = sum(manifest["datasets"].get(dataset_name, {}).get("rows", 0) for manifest in manifests.values())
+            if rows != dataset_rows:
+                log.critical("Shards hold %d of %d rows of %s; regenerate the incomplete shards.", rows, dataset_rows,
+                             dataset_name)
+                sys.exit(1)
+            to_merge.append(dataset_name)
+        log.info("Merging %d datasets from %d shards.", len(to_merge), shard_count)
+        if sql_sink.enabled():
+            for dataset_name in to_merge:
+                combine_chunks(dataset_name)
+        else:
+            with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
+                for future in [executor.submit(combine_task, dataset_name) for dataset_name in to_merge]:
+                    metrics.merge(future.result())
+        remove_shard_manifests(shard_count)
+    finally:
+        release_merge_lock()
+    return True
 
 
 def remove_temp_data():
@@ -101,30 +263,50 @@ def remove_temp_data():
         log.warning("Temporary directory %s does not exist.", TEMP_DATA_DIR)
 
 
-def main():
-    total_start_time = time.time()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the initial synthetic bank datasets.")
+    parser.add_argument("--shard-index", type=int, default=int(os.getenv("SHARD_INDEX", 0)),
+                        help="shard generated by this process (0-based)")
+    parser.add_argument("--shard-count", type=int, default=int(os.getenv("SHARD_COUNT", 1)),
+                        help="number of shards sharing DATA_DIR and TEMP_DATA_DIR")
+    parser.add_argument("--merge-only", action="store_true",
+                        help="only merge finished shards and write the marker file")
+    args = parser.parse_args(argv)
+    if args.shard_count < 1 or not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1")
+    if args.merge_only and args.shard_count == 1:
+        parser.error("--merge-only needs --shard-count")
+    return args
 
-    # Step 1: Ensure customers data is present.
-    if not file_exists_and_has_data("customers.csv"):
-        log.info("Customers file missing or empty. Generating customers...")
-        generate_customers(num_customers_large)
-        combine_chunks("customers")
-    else:
-        log.info("Customers file exists and has data.")
 
-    # Define customer_ids from the customers file.
-    # Here we assume the customers file is created with IDs ranging from 100000 to (100000 + num_customers_large - 1)
-    customer_ids = np.arange(100000, 100000 + num_customers_large)
+def main(argv=None):
+    args = parse_args(argv)
+    total_start_time = time.time()
+    metrics.start_server()
+
+    # Customer IDs are deterministic: the first num_customers_large IDs of the customers sequence, on every shard
+    customer_ids = entity_ids("customers", 0, num_customers_large)
 
-    # Step 2: Check and generate any missing datasets.
-    generate_missing_data(customer_ids)
+    # Generate every missing dataset; customers and branches first, their dependents after, transactions last.
+    if args.shard_count == 1:
+        generate_missing_data(customer_ids)
+    else:
+        if not args.merge_only:
+            run_shard(customer_ids, args.shard_index, args.shard_count)
+        if not merge_shards(args.shard_count):
+            return
 
     # Final check: ensure all files exist and have data.
-    missing_files = [name + ".csv" for name, _, _ in REQUIRED_DATASETS if not file_exists_and_has_data(name + ".csv")]
+    missing_files = [os.path.basename(dataset_path(DATA_DIR, name)) for name, _ in REQUIRED_DATASETS
+                     if not file_exists_and_has_data(name)]
     if missing_files:
         log.critical("Initial data generation failed. The following files are missing or empty: %s", missing_files)
         sys.exit(1)
 
+    # The automator's IDs continue after the rows on disk, which a skipped dataset may hold more of (or from
+    # another scale) than this run configures. Branches are never added to.
+    advance_sequences(initial_sequence_ends(), os.path.join(DATA_DIR, "_manifests", "sequences"))
+
     # Create marker file to indicate initial data generation is complete.
     marker_path = os.path.join(DATA_DIR, "initial_complete.flag")
     with open(marker_path, "w") as f:
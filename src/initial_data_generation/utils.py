@@ -1,30 +1,298 @@
+import hashlib
+import json
 import os
+import re
+import shutil
+import time
 
 import pandas as pd
 from logger import log
 
+from src.common import metrics, sql_sink
+from src.common.schemas import SCHEMAS
+from src.common.sink import (FILE_EXTENSION, OUTPUT_FORMAT, PartWriter, count_rows, dataset_files, dataset_path,
+                             publish_file, read_part)
 from src.config.config import DATA_DIR, CHUNK_SIZE, TEMP_DATA_DIR
 
 # Directories for output
 TEMP_OUTPUT_DIR = TEMP_DATA_DIR
 FINAL_OUTPUT_DIR = DATA_DIR
+# Read size when part files are concatenated without kernel-side copying
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+# Row counts and (optionally) checksums of each combined dataset, used to validate the data volume on restart
+MANIFEST_DIR = os.path.join(FINAL_OUTPUT_DIR, "_manifests")
+VERIFY_CHECKSUMS = os.getenv("VERIFY_CHECKSUMS", "false").lower() in ("1", "true", "yes")
+# Completion records of the shards of a sharded run, and the lock taken by the shard that merges them
+SHARD_MANIFEST_DIR = os.path.join(MANIFEST_DIR, "shards")
+MERGE_LOCK = os.path.join(SHARD_MANIFEST_DIR, "merge.lock")
 
 os.makedirs(TEMP_OUTPUT_DIR, exist_ok=True)
 os.makedirs(FINAL_OUTPUT_DIR, exist_ok=True)
 
-def save_dataframe_in_chunks(df, filename, chunk_size=CHUNK_SIZE):
+def save_dataframe_in_chunks(df, filename, chunk_size=CHUNK_SIZE, first_part=1):
+    # first_part lets workers that generate a row range of a dataset number their parts globally.
     num_chunks = len(df) // chunk_size + (1 if len(df) % chunk_size != 0 else 0)
     log.debug("Saving %d chunks for %s", num_chunks, filename)
     for i in range(num_chunks):
-        chunk = df[i * chunk_size: (i + 1) * chunk_size]
-        chunk.to_csv(f"{TEMP_OUTPUT_DIR}/{filename}_part{i + 1}.csv", index=False)
+        write_chunks([df[i * chunk_size: (i + 1) * chunk_size]], filename, part=first_part + i)
+
+def write_chunks(chunks, filename, part=1):
+    # Stream DataFrame chunks into one part file as they are produced, so a worker never holds more than
+    # one chunk in memory. The part only appears under its final name once it is complete.
+    part_path = f"{TEMP_OUTPUT_DIR}/{filename}_part{part}{FILE_EXTENSION}"
+    chunks = iter(chunks)
+    with PartWriter(part_path, filename) as writer:
+        while True:
+            # Building a chunk happens inside the generator, i.e. while we wait for the next one.
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            metrics.observe("datagen_stage_seconds", time.perf_counter() - started, entity=filename, stage="build")
+            with metrics.stage(filename, "write"):
+                writer.write(chunk)
+    metrics.inc("datagen_rows_total", writer.rows, entity=filename)
+    metrics.inc("datagen_bytes_written_total", os.path.getsize(part_path), entity=filename)
+    return writer.rows
+
+
+def part_files(filename, first_part=1, last_part=None):
+    # Exactly "<filename>_part<N>.<ext>", in numeric part order (part10 after part9, accounts != accounts_archive).
+    pattern = re.compile(rf"^{re.escape(filename)}_part(\d+){re.escape(FILE_EXTENSION)}$")
+    parts = []
+    for f in os.listdir(TEMP_OUTPUT_DIR):
+        match = pattern.match(f)
+        if match and first_part <= int(match.group(1)) and (last_part is None or int(match.group(1)) <= last_part):
+            parts.append((int(match.group(1)), os.path.join(TEMP_OUTPUT_DIR, f)))
+    return [path for _, path in sorted(parts)]
+
+
+def remove_parts(filename, first_part=1, last_part=None):
+    # Leftovers of an interrupted run would overlap the regenerated parts if the task boundaries changed.
+    for path in part_files(filename, first_part, last_part):
+        os.remove(path)
+        log.debug("Removed stale part %s", path)
+
+
+def _copy_bytes(in_fd, out_fd, offset, count):
+    # Let the kernel move the bytes (copy_file_range, then sendfile); fall back to buffered reads.
+    global _kernel_copy
+    if _kernel_copy is not None:
+        try:
+            return _kernel_copy(in_fd, out_fd, offset, count)
+        except OSError:
+            _kernel_copy = _sendfile if _kernel_copy is _copy_file_range and hasattr(os, "sendfile") else None
+            return _copy_bytes(in_fd, out_fd, offset, count)
+    data = os.pread(in_fd, min(count, COPY_BUFFER_SIZE), offset)
+    return os.write(out_fd, data)
+
+
+def _copy_file_range(in_fd, out_fd, offset, count):
+    return os.copy_file_range(in_fd, out_fd, count, offset)
+
+
+def _sendfile(in_fd, out_fd, offset, count):
+    return os.sendfile(out_fd, in_fd, offset, count)
+
+
+_kernel_copy = _copy_file_range if hasattr(os, "copy_file_range") else (
+    _sendfile if hasattr(os, "sendfile") else None)
+
+
+def _append_part(part_path, out, expected_header):
+    with open(part_path, "rb") as part:
+        header = part.readline()
+        if expected_header is not None and header != expected_header:
+            log.warning("Header of %s differs from the first part: %s", part_path, header)
+        # The first part keeps its header; later parts are copied from their first data row on.
+        offset = 0 if expected_header is None else len(header)
+        remaining = os.fstat(part.fileno()).st_size - offset
+        while remaining > 0:
+            copied = _copy_bytes(part.fileno(), out.fileno(), offset, remaining)
+            if copied == 0:
+                break
+            offset += copied
+            remaining -= copied
+    return header
+
 
 def combine_chunks(filename):
-    files = [os.path.join(TEMP_OUTPUT_DIR, f) for f in os.listdir(TEMP_OUTPUT_DIR) if f.startswith(filename)]
+    with metrics.stage(filename, "combine"):
+        _combine_chunks(filename)
+
+
+def _combine_chunks(filename):
+    files = part_files(filename)
     log.debug("Found files for %s: %s", filename, files)
     if not files:
         log.warning("No files found for '%s'. Skipping combination.", filename)
         return
-    combined_df = pd.concat([pd.read_csv(file) for file in files], ignore_index=True)
-    combined_df.to_csv(f"{FINAL_OUTPUT_DIR}/{filename}.csv", index=False)
-    log.info("Final dataset '%s.csv' created successfully.", filename)
\ No newline at end of file
+    final_path = dataset_path(FINAL_OUTPUT_DIR, filename)
+    if sql_sink.enabled():
+        rows = sql_sink.load(_part_frames(files, filename), final_path)
+        log.info("Final table '%s' loaded into %s (%d rows).", sql_sink.table_name(final_path),
+                 sql_sink.SINK_DATABASE, rows)
+        return
+    if OUTPUT_FORMAT != "csv":
+        _publish_parts(files, final_path)
+    elif not (len(files) == 1 and _move(files[0], final_path, publish_file)):
+        tmp_path = final_path + ".tmp"
+        header = None
+        with open(tmp_path, "wb", buffering=0) as out:
+            for file in files:
+                header = _append_part(file, out, header)
+        publish_file(tmp_path, final_path)
+    manifest = write_manifest(filename)
+    log.info("Final dataset '%s' created successfully (%d rows).", manifest["file"], manifest["rows"])
+
+
+def _part_frames(files, entity):
+    # The parts' rows in SINK_INSERT_ROWS slices, with text columns as text and dates as the 'YYYY-MM-DD' and
+    # 'YYYY-MM-DD HH:MM:SS' strings the CSV parts hold, whatever the part format.
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    text = [label for dtype in ("string", "category", "date", "datetime")
+            for label in SCHEMAS[entity].columns_of_type(dtype)]
+    for file in files:
+        if file.endswith(".csv"):
+            # Only empty fields are NULL; 'None' is a value of some columns
+            yield from pd.read_csv(file, dtype={label: str for label in text}, keep_default_na=False, na_values=[""],
+                                   chunksize=sql_sink.SINK_INSERT_ROWS)
+            continue
+        table = read_part(file)
+        for index, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(index, field.name, table[field.name].cast(pa.string()))
+            elif pa.types.is_date(field.type):
+                table = table.set_column(index, field.name, pc.strftime(table[field.name], "%Y-%m-%d"))
+            elif pa.types.is_timestamp(field.type):
+                # Parquet keeps second timestamps in milliseconds, which %S would print with a fraction
+                seconds = table[field.name].cast(pa.timestamp("s"))
+                table = table.set_column(index, field.name, pc.strftime(seconds, "%Y-%m-%d %H:%M:%S"))
+        for batch in table.to_batches(sql_sink.SINK_INSERT_ROWS):
+            yield batch.to_pandas()
+
+
+def _move(src, dst, replace=os.replace):
+    try:
+        replace(src, dst)
+        return True
+    except OSError:
+        # TEMP_DATA_DIR and DATA_DIR on different file systems; copy instead.
+        return False
+
+
+def _publish_parts(files, dataset_dir):
+    # Columnar parts are complete files already, so the dataset directory is assembled from them as they are.
+    tmp_dir = dataset_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for index, file in enumerate(files, 1):
+        target = os.path.join(tmp_dir, f"part-{index:05d}{FILE_EXTENSION}")
+        if not _move(file, target):
+            shutil.copyfile(file, target)
+    # Only datasets found missing or empty are combined, so an existing directory holds no usable rows.
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    os.replace(tmp_dir, dataset_dir)
+
+
+def _manifest_path(name):
+    return os.path.join(MANIFEST_DIR, name + ".json")
+
+
+def _fingerprint(path):
+    # Adding a part file to a columnar dataset changes the directory mtime.
+    return sum(os.path.getsize(f) for f in dataset_files(path)), os.stat(path).st_mtime_ns
+
+
+def dataset_checksum(path):
+    digest = hashlib.sha256()
+    for file_path in dataset_files(path):
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def write_manifest(name):
+    path = dataset_path(FINAL_OUTPUT_DIR, name)
+    size, mtime_ns = _fingerprint(path)
+    manifest = {"file": os.path.basename(path), "format": OUTPUT_FORMAT, "rows": count_rows(path), "size": size,
+                "mtime_ns": mtime_ns, "sha256": dataset_checksum(path) if VERIFY_CHECKSUMS else None,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    manifest_path = _manifest_path(name)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def read_manifest(name):
+    # A manifest only describes the dataset it was written for: once the automator appends to the
+    # dataset its size/mtime change and the manifest is ignored.
+    try:
+        with open(_manifest_path(name)) as f:
+            manifest = json.load(f)
+        fingerprint = _fingerprint(dataset_path(FINAL_OUTPUT_DIR, name))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format", "csv") != OUTPUT_FORMAT or (manifest.get("size"), manifest.get("mtime_ns")) != fingerprint:
+        log.debug("Manifest of %s is stale; ignoring it.", name)
+        return None
+    return manifest
+
+
+def _shard_manifest_path(shard_index, shard_count):
+    return os.path.join(SHARD_MANIFEST_DIR, f"shard-{shard_index:05d}-of-{shard_count:05d}.json")
+
+
+def write_shard_manifest(shard_index, shard_count, datasets, settings):
+    # datasets: {name: {"first_row", "last_row", "rows", "parts"}} for the datasets this shard generated
+    manifest = dict(settings, shard_index=shard_index, shard_count=shard_count, datasets=datasets,
+                    created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    os.makedirs(SHARD_MANIFEST_DIR, exist_ok=True)
+    manifest_path = _shard_manifest_path(shard_index, shard_count)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def read_shard_manifests(shard_count):
+    manifests = {}
+    for shard_index in range(shard_count):
+        try:
+            with open(_shard_manifest_path(shard_index, shard_count)) as f:
+                manifests[shard_index] = json.load(f)
+        except (OSError, ValueError):
+            continue
+    return manifests
+
+
+def remove_shard_manifests(shard_count):
+    for shard_index in range(shard_count):
+        try:
+            os.remove(_shard_manifest_path(shard_index, shard_count))
+        except FileNotFoundError:
+            pass
+
+
+def acquire_merge_lock():
+    # O_EXCL: of several shards finishing at the same time, only one merges.
+    os.makedirs(SHARD_MANIFEST_DIR, exist_ok=True)
+    try:
+        fd = os.open(MERGE_LOCK, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(f"{os.uname().nodename} {os.getpid()}\n")
+    return True
+
+
+def release_merge_lock():
+    try:
+        os.remove(MERGE_LOCK)
+    except FileNotFoundError:
+        pass
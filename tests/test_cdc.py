@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from src.data_automator import cdc
+from src.data_automator.id_registry import IdRegistry
+
+
+def _registry(tmp_path, monkeypatch):
+    registry = IdRegistry(str(tmp_path), str(tmp_path / "cdc"), str(tmp_path / "sequences"))
+    registry.add_customers(np.arange(100000, 100100))
+    monkeypatch.setattr(cdc, "registry", registry)
+    return registry
+
+
+def test_share_updates_keep_total_value_consistent(tmp_path, monkeypatch):
+    _registry(tmp_path, monkeypatch)
+    events = cdc.build_cdc_events("shares", np.arange(900000, 902000), np.random.default_rng(0))
+    updates = events[events["ChangedColumns"].str.contains("TotalValue")]
+    assert len(updates) > 0
+    expected = np.round(updates["Quantity"].astype(float) * updates["CurrentPrice"].astype(float), 2)
+    assert np.allclose(updates["TotalValue"].astype(float), expected)
+
+
+def test_balance_updates_are_dated_on_the_change(tmp_path, monkeypatch):
+    _registry(tmp_path, monkeypatch)
+    events = cdc.build_cdc_events("accounts", np.arange(200000, 202000), np.random.default_rng(0))
+    updates = events[events["ChangedColumns"].str.contains("Balance")]
+    assert len(updates) > 0
+    change_dates = pd.to_datetime(updates["ChangeTime"]).dt.strftime("%Y-%m-%d")
+    assert (updates["LastTransactionDate"] == change_dates).all()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from src.common.sequence import SEQUENCE_BLOCK_SIZE, ids_of, ordinal_after, ordinals_of
+from src.common.sink import dataset_path
+from src.data_automator import scheduler
+from src.data_automator.id_registry import IdRegistry
+
+
+def _write_legacy(data_dir, entity, id_column, first_id, rows):
+    # Data from before the sequences: IDs contiguous from the entity's id_base
+    ids = np.arange(first_id, first_id + rows, dtype=np.int64)
+    pd.DataFrame({id_column: ids}).to_csv(dataset_path(str(data_dir), entity), index=False)
+    return ids
+
+
+def test_ordinal_after_matches_striped_ids():
+    ids = ids_of("accounts", np.array([0, 99999, 100000, 250000]))
+    assert [ordinal_after("accounts", int(i)) for i in ids] == list(ordinals_of("accounts", ids) + 1)
+    assert ordinal_after("accounts", 150000) == 0
+
+
+def test_seed_continues_after_contiguous_legacy_ids(tmp_path):
+    legacy = {"customers": _write_legacy(tmp_path, "customers", "CustomerID", 100000, 125000),
+              "accounts": _write_legacy(tmp_path, "accounts", "AccountID", 200000, 250000)}
+    registry = IdRegistry(str(tmp_path), str(tmp_path / "cdc"), str(tmp_path / "sequences"))
+    registry.seed(list(legacy))
+    for entity, ids in legacy.items():
+        new_ids = registry.next_ids(entity, 1000)
+        assert new_ids.min() > ids.max()
+        assert not np.isin(new_ids, ids).any()
+    # Seeded once: a restarted registry continues from the sequence file
+    restarted = IdRegistry(str(tmp_path), str(tmp_path / "cdc"), str(tmp_path / "sequences"))
+    assert restarted.next_ids("customers", 1).min() > legacy["customers"].max()
+
+
+def test_stop_and_restart_leaves_no_gap(tmp_path, monkeypatch):
+    directories = (str(tmp_path), str(tmp_path / "cdc"), str(tmp_path / "sequences"))
+    registry = IdRegistry(*directories)
+    monkeypatch.setattr(scheduler, "registry", registry)
+    written = []
+
+    def batch(batch_size):
+        ids = registry.next_ids("loans", batch_size)
+        registry.mark_written("loans", ids)
+        written.extend(ids)
+        runner.stop()
+        return batch_size
+
+    runner = scheduler.Scheduler([scheduler.Job("loans", batch, 0, 0, 10)], max_workers=1)
+    runner.run()
+    restarted = IdRegistry(*directories)
+    assert restarted.next_ids("loans", 1)[0] == written[-1] + 1
+    assert restarted._sequences["loans"].gaps == []
+
+
+def test_restart_after_crash_records_gap(tmp_path):
+    directories = (str(tmp_path), str(tmp_path / "cdc"), str(tmp_path / "sequences"))
+    registry = IdRegistry(*directories)
+    registry.mark_written("loans", registry.next_ids("loans", 10))
+    # No release: the rest of the reservation is skipped
+    restarted = IdRegistry(*directories)
+    assert restarted.next_ids("loans", 1)[0] > ids_of("loans", 10)
+    assert restarted._sequences["loans"].gaps == [(10, SEQUENCE_BLOCK_SIZE)]